@@ -0,0 +1,230 @@
+"""
+Cross-sectional batch Poisson vs Hawkes comparison across many symbols.
+
+Takes either a mapping symbol -> event times or one concatenated array with
+offsets (CSR, as produced by Simulation.SimulateHawkesPaths), and runs
+ModelComparison.compare for every symbol on a process pool:
+
+    - jobs are submitted largest event count first, and idle workers pull the
+      next job from the shared queue, so one huge symbol starts early instead
+      of becoming the straggler
+    - rows are yielded / written as they complete (completion order)
+    - an exception in one symbol is recorded in its row's "error" column and
+      does not affect the others; if a worker process dies (e.g. killed for
+      memory), the pool is recreated, the symbols that were in flight are
+      retried one at a time in their own process and the rest are resubmitted,
+      so only the symbol that crashed gets an error row
+    - throughput (symbols/s , events/s) is reported in BatchComparison.stats
+"""
+
+
+import csv
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+try:
+    from backend.ModelComparison import ModelComparison
+except ImportError:
+    from ModelComparison import ModelComparison
+
+
+COLUMNS = ("symbol" , "n" , "T" , "lambda" , "mu" , "alpha" , "beta" , "branching_ratio" ,
+           "loglik_poisson" , "loglik_hawkes" , "aic_poisson" , "aic_hawkes" , "delta_aic" ,
+           "winner" , "error" , "seconds")
+
+
+def _empty_row(symbol , n , T):
+    row = {name: np.nan for name in COLUMNS}
+    row.update(symbol=symbol , n=n , T=T , winner="" , error="")
+    return row
+
+
+def _compare_symbol(symbol , events , T , method , options):
+    """Run one symbol's comparison; never raises, errors go in the row."""
+    started = time.perf_counter()
+    row = _empty_row(symbol , len(events) , T)
+    try:
+        result = ModelComparison(events , T).compare(method=method , options=options)
+        poisson , hawkes = result["poisson"] , result["hawkes"]
+        row.update(
+            loglik_poisson=poisson["loglik"],
+            aic_poisson=result["aic_poisson"],
+            loglik_hawkes=hawkes["loglik"],
+            aic_hawkes=result["aic_hawkes"],
+            delta_aic=result["delta_aic"],
+            winner=result["winner"],
+            mu=hawkes["mu"],
+            alpha=hawkes["alpha"],
+            beta=hawkes["beta"],
+            branching_ratio=hawkes["alpha"] / hawkes["beta"],
+        )
+        row["lambda"] = poisson["lambda"]
+        if hawkes["fit_result"] is None:
+            row["error"] = "Hawkes fit failed"
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    row["seconds"] = time.perf_counter() - started
+    return row
+
+
+class BatchComparison:
+    """
+    Run ModelComparison for every symbol in a universe.
+
+    Attributes:
+        symbols (list): Symbols in input order
+        stats (dict): Throughput of the last run (None before the first run)
+    """
+
+    def __init__(self , data , T , offsets = None , symbols = None):
+        """
+        Args:
+            data: Mapping symbol -> event times, or a flat array of concatenated
+                event times (then offsets and symbols are required)
+            T: Terminal time, either one float for all symbols, a mapping
+                symbol -> T, or a sequence aligned with the symbols
+            offsets (array-like , optional): CSR offsets into a flat `data`, length K + 1
+            symbols (sequence , optional): K symbol names for a flat `data`
+        """
+
+        if offsets is None:
+            self.symbols = list(data)
+            self._events = [data[s] for s in self.symbols]
+        else:
+            if symbols is None or len(symbols) != len(offsets) - 1:
+                raise ValueError("flat input needs len(symbols) == len(offsets) - 1")
+            flat = np.asarray(data , dtype=float)
+            self.symbols = list(symbols)
+            self._events = [flat[offsets[k]:offsets[k + 1]] for k in range(len(self.symbols))]
+
+        if isinstance(T , dict):
+            self._T = [float(T[s]) for s in self.symbols]
+        elif np.ndim(T) == 0:
+            self._T = [float(T)] * len(self.symbols)
+        else:
+            self._T = [float(t) for t in T]
+        self.stats = None
+
+    def iter_results(self , method = "L-BFGS-B" , options = None , n_workers = None):
+        """
+        Yield one result row (dict , see COLUMNS) per symbol as each completes.
+
+        Args:
+            method (str): Optimization method for the Hawkes fits
+            options (dict , optional): Optimizer options
+            n_workers (int , optional): Worker processes (default os.cpu_count(); 1 = in-process)
+        """
+
+        order = sorted(range(len(self.symbols)) , key=lambda k: len(self._events[k]) , reverse=True)
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        n_workers = max(1 , min(int(n_workers) , len(order) or 1))
+
+        if n_workers == 1:
+            for k in order:
+                yield _compare_symbol(self.symbols[k] , self._events[k] , self._T[k] , method , options)
+            return
+
+        pending = order
+        while pending:
+            finished = set()
+            broken = False
+            pool = ProcessPoolExecutor(max_workers=n_workers)
+            try:
+                futures = {self._submit(pool , k , method , options): k for k in pending}
+                not_done = set(futures)
+                while not_done and not broken:
+                    done , not_done = wait(not_done , return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        k = futures[fut]
+                        try:
+                            row = fut.result()
+                        except BrokenProcessPool:
+                            broken = True
+                            continue
+                        except Exception as e:
+                            row = self._error_row(k , e)
+                        finished.add(k)
+                        yield row
+            finally:
+                pool.shutdown(wait=True , cancel_futures=True)
+            if not broken:
+                return
+
+            # A worker died. The executor dispatches in submission order, so the symbols
+            # in flight were the first n_workers + 1 unfinished ones: retry each of those
+            # alone (only the culprit fails again) and resubmit the rest to a fresh pool.
+            unfinished = [k for k in pending if k not in finished]
+            for k in unfinished[:n_workers + 1]:
+                yield self._run_isolated(k , method , options)
+            pending = unfinished[n_workers + 1:]
+
+    def _submit(self , pool , k , method , options):
+        return pool.submit(_compare_symbol , self.symbols[k] , self._events[k] , self._T[k] , method , options)
+
+    def _error_row(self , k , error):
+        row = _empty_row(self.symbols[k] , len(self._events[k]) , self._T[k])
+        row["error"] = f"{type(error).__name__}: {error}"
+        return row
+
+    def _run_isolated(self , k , method , options):
+        """One symbol in its own single-worker pool, so a crash cannot affect any other."""
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            try:
+                return self._submit(pool , k , method , options).result()
+            except Exception as e:
+                return self._error_row(k , e)
+
+    def run(self , method = "L-BFGS-B" , options = None , n_workers = None , out_path = None , on_result = None):
+        """
+        Compare every symbol and collect the rows into columns.
+
+        Args:
+            method (str): Optimization method for the Hawkes fits
+            options (dict , optional): Optimizer options
+            n_workers (int , optional): Worker processes (default os.cpu_count(); 1 = in-process)
+            out_path (str , optional): CSV file; each row is appended and flushed as it completes
+            on_result (callable , optional): Called with each row as it completes
+
+        returns:
+            dict: column name -> np.ndarray (rows in completion order); throughput in self.stats
+        """
+
+        columns = {name: [] for name in COLUMNS}
+        started = time.perf_counter()
+        sink = open(out_path , "w" , newline="") if out_path is not None else None
+        try:
+            writer = None
+            if sink is not None:
+                writer = csv.DictWriter(sink , fieldnames=COLUMNS)
+                writer.writeheader()
+            for row in self.iter_results(method=method , options=options , n_workers=n_workers):
+                for name in COLUMNS:
+                    columns[name].append(row[name])
+                if writer is not None:
+                    writer.writerow(row)
+                    sink.flush()
+                if on_result is not None:
+                    on_result(row)
+        finally:
+            if sink is not None:
+                sink.close()
+
+        elapsed = time.perf_counter() - started
+        n_events = int(sum(columns["n"]))
+        self.stats = {
+            "symbols": len(columns["symbol"]),
+            "failed": sum(1 for err in columns["error"] if err),
+            "events": n_events,
+            "seconds": elapsed,
+            "symbols_per_second": len(columns["symbol"]) / elapsed if elapsed > 0 else float("inf"),
+            "events_per_second": n_events / elapsed if elapsed > 0 else float("inf"),
+        }
+
+        out = {name: np.asarray(values) for name , values in columns.items()}
+        out["symbol"] = np.asarray(columns["symbol"] , dtype=object)
+        return out
@@ -0,0 +1,283 @@
+"""
+Benchmark suite for the hot paths, with JSON results and a regression gate.
+
+Cases (throughput is reported as events per second):
+
+    simulate_hawkes    HawkesProcess.Simulate (thinning)
+    simulate_poisson   PoissonProcess.Simulate
+    intensity_curve    HawkesProcess.GetIntensityCurve / ComputeIntensity (n grid points)
+    log_likelihood     HawkesLikelihood.log_likelihood
+    fit                FitModel.fit (L-BFGS-B , warm start at the true parameters)
+    compare            ModelComparison.compare (L-BFGS-B)
+    run_simulation     backend.main.run_simulation called directly: simulation ,
+                       intensity , plots and JSON encoding of the events; no HTTP ,
+                       process pool or response layer (needs the backend/main.py dependencies)
+
+each over N = 10^3 ... 10^7 events (capped per case and by --max-n) and over
+branching ratios alpha / beta. Inputs are generated from fixed seeds, so two
+runs on the same machine see identical data; every point gets one untimed
+warm-up call and reports the median of its timed repeats.
+
+Usage:
+    python -m backend.Benchmarks run --out results.json [--max-n 1e6] [--cases fit,compare]
+    python -m backend.Benchmarks compare base.json new.json [--threshold 0.1]
+
+compare exits with status 1 when any case's throughput dropped by more than
+the threshold, so it can gate CI.
+"""
+
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+try:
+    from backend.Simulation import PoissonProcess, HawkesProcess
+    from backend.Likelihood import HawkesLikelihood
+    from backend.FitModel import FitModel
+    from backend.ModelComparison import ModelComparison
+    from backend.Kernels import BACKENDS
+except ImportError:
+    from Simulation import PoissonProcess, HawkesProcess
+    from Likelihood import HawkesLikelihood
+    from FitModel import FitModel
+    from ModelComparison import ModelComparison
+    from Kernels import BACKENDS
+
+
+SIZES = (10**3 , 10**4 , 10**5 , 10**6 , 10**7)
+RATIOS = (0.2 , 0.5 , 0.9)
+MU , BETA = 1.0 , 1.0
+SEED = 12345
+
+
+def _hawkes_data(n , ratio):
+    """Roughly n Hawkes events (cluster method , vectorized) with E[N] = n on [0 , T]."""
+    T = n * (1.0 - ratio) / MU
+    h = HawkesProcess(MU , ratio * BETA , BETA)
+    events = h.Simulate(T , rng=np.random.default_rng(SEED) , method="cluster" , max_events=4 * n)
+    return events , T
+
+
+def _case_simulate_hawkes(n , ratio , events , T):
+    h = HawkesProcess(MU , ratio * BETA , BETA)
+    return lambda: len(h.Simulate(T , rng=np.random.default_rng(SEED) , max_events=4 * n))
+
+
+def _case_simulate_poisson(n , ratio , events , T):
+    p = PoissonProcess()
+    return lambda: len(p.Simulate(float(n) , 1.0 , rng=np.random.default_rng(SEED)))
+
+
+def _case_intensity_curve(n , ratio , events , T):
+    h = HawkesProcess(MU , ratio * BETA , BETA)
+    def run():
+        h.GetIntensityCurve(T , n_points=n , events=events)
+        return n
+    return run
+
+
+def _case_log_likelihood(n , ratio , events , T):
+    ll = HawkesLikelihood(events , T)
+    def run():
+        ll.log_likelihood(MU , ratio * BETA , BETA)
+        return len(events)
+    return run
+
+
+def _case_fit(n , ratio , events , T):
+    x0 = np.log([MU , ratio * BETA , BETA])
+    def run():
+        FitModel(events , T).fit(x0=x0 , method="L-BFGS-B")
+        return len(events)
+    return run
+
+
+def _case_compare(n , ratio , events , T):
+    def run():
+        ModelComparison(events , T).compare(method="L-BFGS-B")
+        return len(events)
+    return run
+
+
+def _case_run_simulation(n , ratio , events , T):
+    try:
+        from backend.main import run_simulation
+    except ImportError:
+        from main import run_simulation
+    def run():
+        result = run_simulation(MU , ratio * BETA , BETA , T , SEED , plots=True , deadline=None , max_events=4 * n)
+        json.dumps(dict(result , events=result["events"].tolist() , times=None , intensity=None))
+        return result["n_events"]
+    return run
+
+
+# name -> (factory , largest N , depends on the branching ratio)
+CASES = {
+    "simulate_hawkes": (_case_simulate_hawkes , 10**7 , True),
+    "simulate_poisson": (_case_simulate_poisson , 10**7 , False),
+    "intensity_curve": (_case_intensity_curve , 10**7 , True),
+    "log_likelihood": (_case_log_likelihood , 10**7 , True),
+    "fit": (_case_fit , 10**6 , True),
+    "compare": (_case_compare , 10**6 , True),
+    "run_simulation": (_case_run_simulation , 10**5 , True),
+}
+
+
+def _measure(fn , min_time = 0.5 , max_repeats = 7):
+    """
+    Median seconds and events per call of fn, after one untimed warm-up call
+    (JIT compilation , caches); repeats until min_time has elapsed.
+    """
+    fn()
+    seconds = []
+    count = 0
+    while len(seconds) < max_repeats and (not seconds or sum(seconds) < min_time):
+        started = time.perf_counter()
+        count = fn()
+        seconds.append(time.perf_counter() - started)
+    return float(np.median(seconds)) , len(seconds) , int(count)
+
+
+def machine_metadata():
+    """Environment the numbers were measured in."""
+    try:
+        commit = subprocess.run(["git" , "rev-parse" , "HEAD"] , capture_output=True , text=True ,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "kernel_backends": sorted(BACKENDS),
+        "git_commit": commit,
+    }
+
+
+def run(cases = None , sizes = SIZES , ratios = RATIOS , max_n = 10**6 , min_time = 0.5 , log = print):
+    """
+    Run the benchmark matrix.
+
+    :param cases: case names (default all)
+    :param sizes: event counts N
+    :param ratios: branching ratios alpha / beta
+    :param max_n: global cap on N (per-case caps in CASES also apply)
+    :param min_time: minimum measured time per point, seconds
+    :param log: progress callback (None for silence)
+
+    returns:
+        dict: {"meta": machine_metadata() , "results": [{"case" , "n" , "branching_ratio" ,
+               "seconds" , "repeats" , "events" , "events_per_second"} | {... , "skipped"}]}
+    """
+    names = list(CASES) if cases is None else list(cases)
+    unknown = set(names) - set(CASES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases {sorted(unknown)}; available: {list(CASES)}")
+
+    results = []
+    for n in sizes:
+        for ratio in ratios:
+            events , T = None , None
+            for name in names:
+                factory , case_max , uses_ratio = CASES[name]
+                if n > min(case_max , max_n) or (not uses_ratio and ratio != ratios[0]):
+                    continue
+                if events is None:
+                    events , T = _hawkes_data(n , ratio)
+                row = {"case": name , "n": n , "branching_ratio": ratio if uses_ratio else None}
+                try:
+                    seconds , repeats , count = _measure(factory(n , ratio , events , T) , min_time)
+                except ImportError as e:
+                    row["skipped"] = f"{type(e).__name__}: {e}"
+                else:
+                    row.update(seconds=seconds , repeats=repeats , events=count ,
+                               events_per_second=count / seconds if seconds > 0 else float("inf"))
+                results.append(row)
+                if log is not None:
+                    rate = row.get("events_per_second")
+                    log(f"{name:17s} n={n:>9d} ratio={row['branching_ratio']!s:5s} "
+                        + (f"{rate:14.0f} ev/s" if rate is not None else row["skipped"]))
+    return {"meta": machine_metadata() , "results": results}
+
+
+def compare(base , new , threshold = 0.1):
+    """
+    Throughput change per (case , n , branching_ratio) present in both result sets.
+
+    returns:
+        list: rows {"case" , "n" , "branching_ratio" , "base" , "new" , "change" , "regression"};
+              change is new / base - 1 in events per second
+    """
+    def index(data):
+        return {(r["case"] , r["n"] , r["branching_ratio"]): r["events_per_second"]
+                for r in data["results"] if "events_per_second" in r}
+
+    base_idx , new_idx = index(base) , index(new)
+    rows = []
+    for key in sorted(set(base_idx) & set(new_idx) , key=lambda k: (k[0] , k[1] , k[2] or 0)):
+        change = new_idx[key] / base_idx[key] - 1.0
+        rows.append({"case": key[0] , "n": key[1] , "branching_ratio": key[2] ,
+                     "base": base_idx[key] , "new": new_idx[key] , "change": change ,
+                     "regression": change < -threshold})
+    return rows
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog="python -m backend.Benchmarks" , description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command" , required=True)
+
+    p_run = sub.add_parser("run" , help="run benchmarks and write JSON results")
+    p_run.add_argument("--out" , default="benchmark-results.json")
+    p_run.add_argument("--cases" , help="comma-separated subset of: " + ", ".join(CASES))
+    p_run.add_argument("--max-n" , type=float , default=1e6 , help="largest N to run (default 1e6; up to 1e7)")
+    p_run.add_argument("--ratios" , default=",".join(map(str , RATIOS)))
+    p_run.add_argument("--min-time" , type=float , default=0.5)
+
+    p_cmp = sub.add_parser("compare" , help="compare two result files and flag throughput regressions")
+    p_cmp.add_argument("base")
+    p_cmp.add_argument("new")
+    p_cmp.add_argument("--threshold" , type=float , default=0.1 , help="allowed relative slowdown (default 0.1)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        data = run(cases=args.cases.split(",") if args.cases else None ,
+                   ratios=tuple(float(r) for r in args.ratios.split(",")) ,
+                   max_n=int(args.max_n) , min_time=args.min_time)
+        with open(args.out , "w") as fh:
+            json.dump(data , fh , indent=1)
+        print(f"wrote {len(data['results'])} results to {args.out}")
+        return 0
+
+    with open(args.base) as fh:
+        base = json.load(fh)
+    with open(args.new) as fh:
+        new = json.load(fh)
+    for field in ("platform" , "processor" , "cpu_count" , "numpy"):
+        if base["meta"].get(field) != new["meta"].get(field):
+            print(f"note: {field} differs ({base['meta'].get(field)} vs {new['meta'].get(field)})")
+
+    rows = compare(base , new , threshold=args.threshold)
+    for r in rows:
+        flag = "REGRESSION" if r["regression"] else ""
+        print(f"{r['case']:17s} n={r['n']:>9d} ratio={r['branching_ratio']!s:5s} "
+              f"{r['base']:14.0f} -> {r['new']:14.0f} ev/s  {r['change']:+7.1%}  {flag}")
+    n_bad = sum(r["regression"] for r in rows)
+    print(f"{len(rows)} compared , {n_bad} regression(s) beyond {args.threshold:.0%}")
+    return 1 if n_bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+Chunked / out-of-core Hawkes log-likelihood with a parallel prefix-scan combine.
+
+The kernel recursion g_i = exp(-beta dt_i) (1 + g_{i-1}) is an affine map of the
+carried state, so a sorted event array can be cut into chunks that are
+processed independently:
+
+    1. Each chunk reports its summary (t_first , t_last , G , H): the local
+       excitation 1 + g and its beta-derivative at its last event, starting
+       from an empty state. These are closed-form sums
+           G = sum_j e^{-beta (t_last - t_j)} ,  H = -sum_j (t_last - t_j) e^{-beta (t_last - t_j)}
+       so no recursion runs here.
+    2. Summaries are merged left to right with the associative combine
+           (G , H)_{L+R} = e^{-beta D} (G_L , H_L - D G_L) + (G_R , H_R),  D = t_last_R - t_last_L
+       giving every chunk the exact incoming state (an exclusive prefix scan).
+    3. Each chunk runs the recursion once, from its incoming state, and returns
+       partial sums of the log-likelihood and gradient, which are simply added.
+
+Steps 1 and 3 run in worker processes. Sources given as .npy paths or
+np.memmap arrays are re-opened memory-mapped in each worker, so only one
+chunk per worker is ever resident and nothing but offsets is pickled. With a
+single worker the chunks are swept in order instead, each passing its end
+state straight to the next, and steps 1 and 2 are skipped.
+
+The worker pool is shut down by close(), on leaving a `with` block, or when
+the object is garbage collected.
+"""
+
+
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    from backend.Kernels import get_decay_sums, get_decay_derivs
+except ImportError:
+    from Kernels import get_decay_sums, get_decay_derivs
+
+
+def _source_of(events):
+    """Picklable description of where the events live."""
+    if isinstance(events , (str , os.PathLike)):
+        return ("npy" , os.fspath(events))
+    if isinstance(events , np.memmap) and events.filename is not None:
+        return ("memmap" , events.filename , events.dtype.str , events.offset , events.shape)
+    return ("array" , np.asarray(events , dtype=float))
+
+
+def _open_source(source):
+    kind = source[0]
+    if kind == "npy":
+        return np.load(source[1] , mmap_mode="r")
+    if kind == "memmap":
+        return np.memmap(source[1] , dtype=source[2] , mode="r" , offset=source[3] , shape=source[4])
+    return source[1]
+
+
+def _load_chunk(source , start , stop):
+    chunk = np.ascontiguousarray(_open_source(source)[start:stop] , dtype=float)
+    if np.any(chunk[1:] < chunk[:-1]):
+        raise ValueError(f"events must be sorted (chunk [{start} , {stop}))")
+    return chunk
+
+
+def _chunk_summary(source , start , stop , beta , with_grad):
+    """Step 1: local end-state of one chunk, starting from an empty state (no recursion)."""
+    chunk = _load_chunk(source , start , stop)
+    D = chunk[-1] - chunk
+    e = np.exp(-beta * D)
+    H = -np.sum(D * e) if with_grad else 0.0
+    return chunk[0] , chunk[-1] , np.sum(e) , H
+
+
+def _combine(left , right , beta):
+    """Associative merge of two adjacent chunk summaries."""
+    t_first , t_last_l , G_l , H_l = left
+    _ , t_last_r , G_r , H_r = right
+    D = t_last_r - t_last_l
+    d = np.exp(-beta * D)
+    return t_first , t_last_r , d * G_l + G_r , d * (H_l - D * G_l) + H_r
+
+
+def _chunk_terms(source , start , stop , mu , alpha , beta , T , carry , backend , with_grad , eps):
+    """
+    Step 3: partial log-likelihood (and gradient) sums for one chunk given its
+    incoming state (t_ref , G , H), or None for the first chunk.
+
+    returns:
+        tuple: (terms dict , end state (t_last , G , H) to carry into the next chunk)
+    """
+    chunk = _load_chunk(source , start , stop)
+    if with_grad:
+        g , h , _ = get_decay_derivs(backend)(chunk , beta)
+    else:
+        g = get_decay_sums(backend)(chunk , beta)
+    if carry is not None:
+        t_ref , G0 , H0 = carry
+        if chunk[0] < t_ref:
+            raise ValueError("events must be sorted across chunk boundaries")
+        D = chunk - t_ref
+        d = np.exp(-beta * D)
+        g = G0 * d + g
+        if with_grad:
+            h = d * (H0 - D * G0) + h
+    lambdas = mu + alpha * g
+
+    s = T - chunk
+    E = np.exp(-beta * s)
+    terms = {
+        "logsum": np.sum(np.log(lambdas + eps)),
+        "nonpositive": bool(np.any(lambdas <= 0)),
+        "comp": np.sum(1.0 - E),
+    }
+    if with_grad:
+        inv = 1.0 / lambdas
+        terms.update(inv=np.sum(inv) , g_inv=np.sum(g * inv) , h_inv=np.sum(h * inv) , sE=np.sum(s * E))
+    return terms , (chunk[-1] , 1.0 + g[-1] , h[-1] if with_grad else 0.0)
+
+
+class ChunkedLikelihood:
+    """
+    Log-likelihood (and gradient) over chunked, possibly memory-mapped event arrays.
+
+    Attributes:
+        T (float): Terminal time
+        n (int): Number of events
+        chunk_size (int): Events per chunk
+        n_workers (int): Worker processes (1 = run chunks in this process)
+    """
+
+    def __init__(self , events , T , chunk_size = 2**20 , n_workers = None , backend = None):
+        """
+        :param events: Sorted event times: a path to a .npy file, an np.memmap, or an array.
+            Plain in-memory arrays are processed chunk by chunk in this process.
+        :param T: Terminal time > 0
+        :param chunk_size: Events per chunk
+        :param n_workers: Worker processes for file-backed sources (default os.cpu_count())
+        :param backend: Kernel backend, see Kernels.get_decay_sums
+        """
+
+        self._source = _source_of(events)
+        self.T = float(T)
+        self.n = len(_open_source(self._source))
+        self.chunk_size = int(chunk_size)
+        self.backend = backend
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        if self._source[0] == "array":
+            n_workers = 1
+        self.n_workers = max(1 , int(n_workers))
+        self._pool = None
+        self._finalizer = None
+        self._bounds = [(start , min(start + self.chunk_size , self.n))
+                        for start in range(0 , self.n , self.chunk_size)]
+
+    def _map(self , fn , arg_lists):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.n_workers)
+            # shut the workers down even if close() is never called
+            self._finalizer = weakref.finalize(self , self._pool.shutdown)
+        futures = [self._pool.submit(fn , *args) for args in arg_lists]
+        return [f.result() for f in futures]
+
+    def _evaluate(self , mu , alpha , beta , with_grad , eps):
+        if self.n_workers == 1 or len(self._bounds) == 1:
+            # in order: each chunk's end state is the next one's incoming state
+            terms = []
+            carry = None
+            for start , stop in self._bounds:
+                chunk_terms , carry = _chunk_terms(self._source , start , stop , mu , alpha , beta , self.T ,
+                                                   carry , self.backend , with_grad , eps)
+                terms.append(chunk_terms)
+            return {key: sum(t[key] for t in terms) for key in terms[0]}
+
+        summaries = self._map(_chunk_summary , [
+            (self._source , start , stop , beta , with_grad)
+            for start , stop in self._bounds
+        ])
+
+        # exclusive prefix scan: incoming state (t_ref , G , H) for every chunk
+        carries = [None]
+        acc = summaries[0]
+        for prev , summary in zip(summaries[:-1] , summaries[1:]):
+            if summary[0] < prev[1]:
+                raise ValueError("events must be sorted across chunk boundaries")
+            carries.append((acc[1] , acc[2] , acc[3]))
+            acc = _combine(acc , summary , beta)
+
+        terms = [t for t , _ in self._map(_chunk_terms , [
+            (self._source , start , stop , mu , alpha , beta , self.T , carry , self.backend , with_grad , eps)
+            for (start , stop) , carry in zip(self._bounds , carries)
+        ])]
+        return {key: sum(t[key] for t in terms) for key in terms[0]}
+
+    def log_likelihood(self , mu , alpha , beta , eps = 1e-12):
+        """
+        Same value as HawkesLikelihood.log_likelihood, computed chunk-parallel.
+
+        returns:
+        float: log_likelihood value or -inf if parameters invalid
+        """
+
+        if mu <= 0 or alpha < 0 or beta <= 0:
+            return -np.inf
+        if self.n == 0:
+            return -mu * self.T
+
+        tot = self._evaluate(mu , alpha , beta , False , eps)
+        if tot["nonpositive"]:
+            return -np.inf
+        return tot["logsum"] - mu * self.T - (alpha / beta) * tot["comp"]
+
+    def log_likelihood_and_gradient(self , mu , alpha , beta , eps = 1e-12):
+        """
+        Same as HawkesLikelihood.log_likelihood_and_gradient (without Hessian), chunk-parallel.
+
+        returns:
+        tuple: (L , grad) ; L = -inf and NaN gradient if invalid
+        """
+
+        if mu <= 0 or alpha < 0 or beta <= 0:
+            return -np.inf , np.full(3 , np.nan)
+        T = self.T
+        if self.n == 0:
+            return -mu * T , np.array([-T , 0.0 , 0.0])
+
+        tot = self._evaluate(mu , alpha , beta , True , eps)
+        comp = tot["comp"]
+        loglik = tot["logsum"] - mu * T - (alpha / beta) * comp
+        grad = np.array([
+            tot["inv"] - T,
+            tot["g_inv"] - comp / beta,
+            alpha * tot["h_inv"] + (alpha / beta**2) * comp - (alpha / beta) * tot["sE"],
+        ])
+        return loglik , grad
+
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self , *exc):
+        self.close()
@@ -0,0 +1,207 @@
+"""
+On-disk store of preprocessed event arrays, memory-mapped on load.
+
+Layout under the store root:
+
+    data/<hash>.npy    one float64 .npy file per distinct series (content-addressed)
+    index.json         {"<symbol>/<date>": {"hash" , "T" , "n" , "options" , "created"}}
+
+Series are keyed by symbol and date and identified by a content hash of their
+bytes, so storing the same array twice writes it once. get() returns a
+read-only np.memmap: nothing is copied, and worker processes that open the
+same series share the OS page cache instead of re-parsing CSVs.
+
+put() and delete() hold an exclusive lock on index.lock while they update
+index.json and the data files, so concurrent writers (threads or processes)
+do not lose each other's entries. Symbols may not contain "/".
+"""
+
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to an O_EXCL lock file
+    fcntl = None
+
+
+def content_hash(events , T = None):
+    """
+    Fast content hash (blake2b , 128 bit) of an event buffer, optionally with T.
+
+    :param events: array-like of event times (hashed as contiguous float64)
+    :param T: optional terminal time folded into the hash
+
+    returns:
+        str: hex digest
+    """
+    buf = np.ascontiguousarray(events , dtype=np.float64)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(memoryview(buf).cast("B"))
+    if T is not None:
+        h.update(np.float64(T).tobytes())
+    return h.hexdigest()
+
+
+class EventStore:
+    """
+    Content-addressed, memory-mapped event array store.
+
+    Attributes:
+        root (str): Store directory
+    """
+
+    def __init__(self , root):
+        """
+        :param root: Directory for the store (created if missing)
+        """
+
+        self.root = os.path.abspath(os.fspath(root))
+        self._data_dir = os.path.join(self.root , "data")
+        self._index_path = os.path.join(self.root , "index.json")
+        self._lock_path = os.path.join(self.root , "index.lock")
+        os.makedirs(self._data_dir , exist_ok=True)
+
+    @staticmethod
+    def key(symbol , date):
+        symbol = str(symbol)
+        if "/" in symbol:
+            raise ValueError(f"symbol may not contain '/': {symbol!r}")
+        return f"{symbol}/{date}"
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock around a read-modify-write of the index and data files."""
+        if fcntl is not None:
+            with open(self._lock_path , "a") as fh:
+                fcntl.flock(fh , fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(fh , fcntl.LOCK_UN)
+            return
+
+        while True:
+            try:
+                fd = os.open(self._lock_path , os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            os.remove(self._lock_path)
+
+    def _read_index(self):
+        if not os.path.exists(self._index_path):
+            return {}
+        with open(self._index_path) as fh:
+            return json.load(fh)
+
+    def _write_index(self , index):
+        # write to a temp file and rename so readers never see a partial index
+        fd , tmp = tempfile.mkstemp(dir=self.root , suffix=".json.tmp")
+        with os.fdopen(fd , "w") as fh:
+            json.dump(index , fh , indent=1 , sort_keys=True)
+        os.replace(tmp , self._index_path)
+
+    def _data_path(self , digest):
+        return os.path.join(self._data_dir , digest + ".npy")
+
+    def put(self , events , symbol , date , T , options = None):
+        """
+        Store a series (sorted float64 events on [0 , T]) under symbol / date.
+
+        :param events: event times
+        :param symbol: instrument symbol
+        :param date: trading date (any string-able value, e.g. "2024-01-02")
+        :param T: terminal time
+        :param options: preprocessing options to record (e.g. Ingest.load_ticks()["options"])
+
+        returns:
+            str: content hash of the series
+        """
+
+        key = self.key(symbol , date)
+        events = np.ascontiguousarray(events , dtype=np.float64)
+        digest = content_hash(events)
+        path = self._data_path(digest)
+
+        # under the lock, so a concurrent delete() cannot remove the data file
+        # between writing it and indexing it
+        with self._locked():
+            if not os.path.exists(path):
+                fd , tmp = tempfile.mkstemp(dir=self._data_dir , suffix=".npy.tmp")
+                with os.fdopen(fd , "wb") as fh:
+                    np.save(fh , events)
+                os.replace(tmp , path)
+
+            index = self._read_index()
+            index[key] = {
+                "hash": digest,
+                "T": float(T),
+                "n": int(len(events)),
+                "options": options,
+                "created": time.time(),
+            }
+            self._write_index(index)
+        return digest
+
+    def meta(self , symbol , date):
+        """Index entry for symbol / date; KeyError if missing."""
+        return self._read_index()[self.key(symbol , date)]
+
+    def get(self , symbol , date):
+        """
+        Load a series zero-copy.
+
+        returns:
+            tuple: (read-only np.memmap of events , metadata dict)
+        """
+        entry = self.meta(symbol , date)
+        return self.get_by_hash(entry["hash"]) , entry
+
+    def get_by_hash(self , digest):
+        """Read-only memory map of the series with this content hash."""
+        path = self._data_path(digest)
+        if not os.path.exists(path):
+            raise KeyError(digest)
+        return np.load(path , mmap_mode="r")
+
+    def path(self , symbol , date):
+        """File path of a series, e.g. for ChunkedLikelihood workers."""
+        return self._data_path(self.meta(symbol , date)["hash"])
+
+    def list(self , symbol = None):
+        """
+        Index entries, optionally for one symbol.
+
+        returns:
+            dict: key "<symbol>/<date>" -> metadata
+        """
+        index = self._read_index()
+        if symbol is None:
+            return index
+        symbol = str(symbol)
+        return {k: v for k , v in index.items() if k.split("/" , 1)[0] == symbol}
+
+    def delete(self , symbol , date):
+        """Remove symbol / date from the index; the data file goes once nothing references it."""
+        key = self.key(symbol , date)
+        with self._locked():
+            index = self._read_index()
+            entry = index.pop(key)
+            self._write_index(index)
+            if not any(v["hash"] == entry["hash"] for v in index.values()):
+                try:
+                    os.remove(self._data_path(entry["hash"]))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,210 @@
+"""
+Memoization of FitModel.fit and ModelComparison.compare results.
+
+Keys combine a content hash of the event buffer and T with the fit
+configuration (kind , method , x0 , options), so the same upload, window or
+dashboard reload maps to the same entry. Two tiers:
+
+    - memory: LRU bounded by total pickled size (max_bytes)
+    - disk (optional): one pickle per key under disk_dir, consulted on a
+      memory miss and written through on every store
+
+Values are stored pickled and unpickled on every hit, so callers get their own
+copy and cannot corrupt the cache. Hashing the events is O(n); pass
+events_hash (e.g. EventStore metadata["hash"]) to skip it on hot paths.
+
+One instance may be shared between threads (the LRU bookkeeping is locked).
+The disk tier unpickles whatever it finds under disk_dir, and unpickling can
+run arbitrary code: disk_dir must be a trusted directory that only this
+service can write to, never a shared or user-supplied location.
+"""
+
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    from backend.EventStore import content_hash
+    from backend.FitModel import FitModel
+    from backend.ModelComparison import ModelComparison
+except ImportError:
+    from EventStore import content_hash
+    from FitModel import FitModel
+    from ModelComparison import ModelComparison
+
+
+def _config_repr(value):
+    """Stable JSON-able form of x0 / options for hashing."""
+    if value is None:
+        return None
+    if isinstance(value , dict):
+        return {str(k): _config_repr(v) for k , v in sorted(value.items())}
+    if isinstance(value , (list , tuple , np.ndarray)):
+        return [_config_repr(v) for v in np.asarray(value , dtype=object).ravel().tolist()]
+    if isinstance(value , (np.floating , float)):
+        return float(value).hex()
+    if isinstance(value , (np.integer , int , bool , str)):
+        return value.item() if isinstance(value , np.generic) else value
+    return repr(value)
+
+
+class FitCache:
+    """
+    Two-tier LRU cache of fit / comparison results.
+
+    Attributes:
+        max_bytes (int): Memory budget for pickled entries
+        disk_dir (str or None): Directory of the on-disk tier
+        hits , misses , disk_hits , evictions (int): Counters since creation / clear()
+    """
+
+    def __init__(self , max_bytes = 64 * 2**20 , disk_dir = None):
+        """
+        :param max_bytes: Memory budget for the in-memory tier
+        :param disk_dir: Optional directory for the on-disk tier (created if missing);
+            its files are unpickled, so it must only be writable by trusted code
+        """
+
+        self.max_bytes = int(max_bytes)
+        self.disk_dir = os.path.abspath(os.fspath(disk_dir)) if disk_dir is not None else None
+        if self.disk_dir is not None:
+            os.makedirs(self.disk_dir , exist_ok=True)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(kind , events , T , method = None , x0 = None , options = None , events_hash = None):
+        """
+        Cache key for one fit configuration.
+
+        :param kind: "fit" or "compare"
+        :param events: event times (ignored if events_hash is given)
+        :param T: terminal time
+        :param events_hash: precomputed EventStore.content_hash(events)
+
+        returns:
+            str: hex key
+        """
+        if events_hash is None:
+            events_hash = content_hash(events)
+        config = json.dumps(
+            [kind , events_hash , float(T).hex() , method , _config_repr(x0) , _config_repr(options)] ,
+            sort_keys=True ,
+        )
+        return hashlib.blake2b(config.encode() , digest_size=16).hexdigest()
+
+    def _disk_path(self , key):
+        return os.path.join(self.disk_dir , key + ".pkl")
+
+    def _store_memory(self , key , blob):
+        # caller holds self._lock
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        if len(blob) > self.max_bytes:
+            return
+        self._entries[key] = blob
+        self._size += len(blob)
+        while self._size > self.max_bytes:
+            _ , old = self._entries.popitem(last=False)
+            self._size -= len(old)
+            self.evictions += 1
+
+    def get(self , key , default = None):
+        """Cached value for key (a fresh copy), or default; updates the counters."""
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if blob is not None:
+            return pickle.loads(blob)
+
+        if self.disk_dir is not None:
+            try:
+                with open(self._disk_path(key) , "rb") as fh:
+                    blob = fh.read()
+            except FileNotFoundError:
+                blob = None
+        with self._lock:
+            if blob is None:
+                self.misses += 1
+                return default
+            self._store_memory(key , blob)
+            self.hits += 1
+            self.disk_hits += 1
+        return pickle.loads(blob)
+
+    def put(self , key , value):
+        """Store value under key in memory and, if configured, on disk."""
+        blob = pickle.dumps(value , protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._store_memory(key , blob)
+        if self.disk_dir is not None:
+            fd , tmp = tempfile.mkstemp(dir=self.disk_dir , suffix=".pkl.tmp")
+            with os.fdopen(fd , "wb") as fh:
+                fh.write(blob)
+            os.replace(tmp , self._disk_path(key))
+
+    def fit(self , events , T , x0 = None , method = "Nelder-Mead" , options = None , events_hash = None ,
+            return_hit = False):
+        """
+        Memoized FitModel(events , T).fit(x0 , method , options).
+
+        With return_hit=True returns (result , hit), hit being True when the
+        result came from the cache and no fit ran.
+        """
+        key = self.key("fit" , events , T , method , x0 , options , events_hash)
+        res = self.get(key)
+        hit = res is not None
+        if not hit:
+            res = FitModel(events , T).fit(x0=x0 , method=method , options=options)
+            self.put(key , res)
+        return (res , hit) if return_hit else res
+
+    def compare(self , events , T , x0 = None , method = "Nelder-Mead" , options = None , events_hash = None ,
+                return_hit = False):
+        """Memoized ModelComparison(events , T).compare(x0 , method , options); return_hit as in fit()."""
+        key = self.key("compare" , events , T , method , x0 , options , events_hash)
+        res = self.get(key)
+        hit = res is not None
+        if not hit:
+            res = ModelComparison(events , T).compare(x0=x0 , method=method , options=options)
+            self.put(key , res)
+        return (res , hit) if return_hit else res
+
+    def stats(self):
+        """Counters and current memory usage."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
+
+    def clear(self , disk = False):
+        """Drop the memory tier (and the disk tier if disk=True) and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = self.misses = self.disk_hits = self.evictions = 0
+        if disk and self.disk_dir is not None:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.disk_dir , name))
@@ -6,17 +6,42 @@ Uses log-parameterization to enforce positivity and includes soft stability cons
 """ 
 
 import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+import os
+import time
 
 try:
-    from scipy.optimize import minimize
+    from scipy.optimize import minimize, OptimizeResult
 except ImportError:
     minimize = None
 
+    class OptimizeResult(dict):
+        """Minimal stand-in for scipy's result object (attribute access to keys)."""
+
+        def __getattr__(self , name):
+            try:
+                return self[name]
+            except KeyError as e:
+                raise AttributeError(name) from e
+
+        __setattr__ = dict.__setitem__
+
 
 try:
     from backend.Likelihood import HawkesLikelihood
+    from backend.Kernels import get_decay_derivs
 except ImportError:
     from Likelihood import HawkesLikelihood
+    from Kernels import get_decay_derivs
+
+
+# scipy methods that take an analytic gradient (jac) / Hessian (hess)
+GRADIENT_METHODS = {"CG", "BFGS", "L-BFGS-B", "TNC", "SLSQP",
+                    "Newton-CG", "trust-ncg", "trust-krylov", "trust-exact", "trust-constr"}
+HESSIAN_METHODS = {"Newton-CG", "trust-ncg", "trust-krylov", "trust-exact", "trust-constr"}
 
 class FitModel:
     """
@@ -26,6 +51,10 @@ class FitModel:
     A large penalty is returned is alpha / beta >=1 
     (stabilty violation).
 
+    Gradient-based scipy methods (L-BFGS-B, trust-constr, Newton-CG, ...) get the
+    exact gradient / Hessian from HawkesLikelihood, mapped to log-space with the
+    chain rule d/dx = theta * d/dtheta.
+
     Attributes:
         event (np.ndarray) : Event times
         T (float): Terminal time
@@ -47,6 +76,12 @@ class FitModel:
         self.events = events
         self.T = T
         self.ll = HawkesLikelihood(self.events , self.T)
+        # fit_profile caches: beta -> (g , C) arrays (small LRU) and
+        # (beta , max_ratio , newton_steps) -> profile optimum
+        self._beta_arrays = OrderedDict()
+        self._beta_profile = {}
+        # set by fit_multistart workers: a shared Event that aborts fit() when set
+        self._stop = None
 
     def _neg_loglik_from_logparams(self , x):
         """
@@ -75,21 +110,75 @@ class FitModel:
         if not np.isfinite(val):
             return 1e12
         return -val
+
+    def _neg_loglik_and_grad_from_logparams(self , x):
+        """
+            Objective and its gradient w.r.t. the log-parameters.
+
+            Args:
+                x (np.ndarray) : log-parameters [log(mu) , log(alpha) , log(beta)]
+
+            Returns:
+            tuple: (value , gradient) matching _neg_loglik_from_logparams
+        """
+
+        theta = np.exp(np.asarray(x , dtype=float))
+        mu , alpha , beta = theta
+        ratio = alpha / beta
+        if ratio >= 1.0:
+            # gradient of the linear penalty 1e8 * (alpha/beta - 1) in log-space
+            return 1e12 + 1e8 * (ratio - 1.0) , np.array([0.0 , 1e8 * ratio , -1e8 * ratio])
+
+        val , grad = self.ll.log_likelihood_and_gradient(mu , alpha , beta)
+        if not np.isfinite(val) or not np.all(np.isfinite(grad)):
+            return 1e12 , np.zeros(3)
+        return -val , -theta * grad
+
+    def _neg_hess_from_logparams(self , x):
+        """
+            Hessian of the objective w.r.t. the log-parameters.
+
+            With theta = exp(x): H_x = diag(theta) H_theta diag(theta) + diag(theta * grad_theta)
+
+            Args:
+                x (np.ndarray) : log-parameters [log(mu) , log(alpha) , log(beta)]
+
+            Returns:
+            np.ndarray: 3x3 Hessian of the negative log-likelihood
+        """
+
+        theta = np.exp(np.asarray(x , dtype=float))
+        mu , alpha , beta = theta
+        if alpha / beta >= 1.0:
+            return np.zeros((3 , 3))
+
+        val , grad , hess = self.ll.log_likelihood_and_gradient(mu , alpha , beta , hessian=True)
+        if not np.isfinite(val) or not np.all(np.isfinite(hess)):
+            return np.zeros((3 , 3))
+        hess_x = theta[: , None] * hess * theta[None , :] + np.diag(theta * grad)
+        return -hess_x
     
     def fit(self , x0= None , method="Nelder-Mead" , options=None):
         """
             Fit parameter via scipy.optimize.minimize
 
+            Methods in GRADIENT_METHODS are given the analytic gradient (and the
+            Hessian for HESSIAN_METHODS); derivative-free methods only see the
+            objective value.
+
             Args:
                 x0(np.ndarray , optional): Initial guess in log-space.
                     Defaults to log([0.1 , 0.1, 1.0])
                 method (str) : Optimization method(default: "Nelder-Mead")
                 options (dict , optional): Options dict passes to minimize
-                    Default to {"maxiter" : 20000, "disp" : False}
+                    Default to {"maxiter" : 20000, "disp" : False} for
+                    derivative-free methods and {"maxiter" : 20000} otherwise
 
             Returns:
                 scipy.optimize.OptimizeResult: Result object with .result_params dict added.
                     result_params contains {"mu" , "alpha" , "beta"}
+                    and .timing {"evaluations" , "objective_seconds" ,
+                    "seconds_per_evaluation" , "total_seconds"}
         """
 
         if minimize is None:
@@ -101,10 +190,39 @@ class FitModel:
             #default initialization (log space)
             x0 = np.log(np.array([0.1 , 0.1, 1.0]) , dtype=float)
 
-        if options is None:
-            options = {"maxiter" : 20000, "disp" : False}
-        
-        res = minimize(self._neg_loglik_from_logparams , x0 , method=method , options=options)
+        started = time.perf_counter()
+        evaluations = [0 , 0.0]  # count , seconds spent in the objective
+
+        def timed(objective):
+            def wrapped(x):
+                if self._stop is not None and self._stop.is_set():
+                    raise _StartCancelled()
+                t0 = time.perf_counter()
+                try:
+                    return objective(x)
+                finally:
+                    evaluations[0] += 1
+                    evaluations[1] += time.perf_counter() - t0
+            return wrapped
+
+        if method in GRADIENT_METHODS:
+            if options is None:
+                options = {"maxiter" : 20000}
+            hess = self._neg_hess_from_logparams if method in HESSIAN_METHODS else None
+            res = minimize(timed(self._neg_loglik_and_grad_from_logparams) , x0 , method=method ,
+                           jac=True , hess=hess , options=options)
+        else:
+            if options is None:
+                options = {"maxiter" : 20000, "disp" : False}
+            res = minimize(timed(self._neg_loglik_from_logparams) , x0 , method=method , options=options)
+
+        n_evals , objective_seconds = evaluations
+        res.timing = {
+            "evaluations": n_evals,
+            "objective_seconds": objective_seconds,
+            "seconds_per_evaluation": objective_seconds / n_evals if n_evals else 0.0,
+            "total_seconds": time.perf_counter() - started,
+        }
 
         #Added fitted parameters to result object
 
@@ -114,4 +232,443 @@ class FitModel:
             "alpha" : float(res_params[1]),
             "beta" : float(res_params[2]),
         }
-        return res
\ No newline at end of file
+        return res
+
+    def fit_em(self , x0 = None , max_iter = 500 , tol = 1e-8 , window = None):
+        """
+            Fit parameters by Expectation-Maximization on the branching structure.
+
+            E-step: event i is an immigrant with probability mu / lambda_i and a
+            child of earlier events with total probability alpha g_i / lambda_i.
+            The expected parent distance sum_j p_ij (t_i - t_j) = -alpha h_i / lambda_i
+            comes from the same O(n) recursion (h = dg/dbeta), so no n x n matrix
+            is ever formed.
+
+            M-step (closed form, kernel written as n * beta * exp(-beta s)):
+                mu    = sum_i p_ii / T
+                beta  = sum_{i,j} p_ij / sum_{i,j} p_ij (t_i - t_j)
+                n     = sum_{i,j} p_ij / sum_j (1 - exp(-beta (T - t_j)))
+                alpha = n * beta
+            The beta update ignores the end-of-window term, as is standard; there
+            is no stability penalty, so iterates never hit the 1e12 plateau.
+
+            Args:
+                x0 (np.ndarray , optional): Initial guess in log-space.
+                    Defaults to mu = n/(2T) , alpha = 0.5 , beta = 1
+                max_iter (int): Maximum EM iterations
+                tol (float): Stop when the log-likelihood improves by less than
+                    tol * max(1 , |L|)
+                window (float , optional): Only events within `window` before t_i
+                    can be its parent (kernel truncated at window); the truncated
+                    sums are obtained from the full recursion by subtracting the
+                    state of the last event outside the window
+
+            Returns:
+                OptimizeResult: x (log-params) , fun (negative log-likelihood) , nit ,
+                    success , message , result_params as in fit()
+        """
+
+        events = self.ll.events
+        T = self.ll.T
+        n = self.ll.n
+        if n == 0:
+            raise ValueError("EM needs at least one event")
+
+        if x0 is None:
+            mu , alpha , beta = 0.5 * n / T , 0.5 , 1.0
+        else:
+            mu , alpha , beta = np.exp(np.asarray(x0 , dtype=float))
+        decay_derivs = get_decay_derivs(self.ll.backend)
+
+        s = T - events
+        if window is not None:
+            s = np.minimum(s , window)
+            # index of the last event more than `window` before each event
+            outside = np.searchsorted(events , events - window , side="left") - 1
+            has_outside = outside >= 0
+
+        def e_step(mu , alpha , beta):
+            g , h , _ = decay_derivs(events , beta)
+            if window is not None:
+                k = outside[has_outside]
+                D = events[has_outside] - events[k]
+                tail = np.exp(-beta * D)
+                # sum_{j <= k} exp(-beta (t_i - t_j)) = tail * (1 + g_k), and its beta-derivative
+                g_tail = tail * (1.0 + g[k])
+                h_tail = tail * (h[k] - D * (1.0 + g[k]))
+                g = g.copy()
+                h = h.copy()
+                g[has_outside] = np.maximum(g[has_outside] - g_tail , 0.0)
+                h[has_outside] = np.minimum(h[has_outside] - h_tail , 0.0)
+            lambdas = mu + alpha * g
+            comp = np.sum(1.0 - np.exp(-beta * s))
+            loglik = np.sum(np.log(lambdas)) - mu * T - (alpha / beta) * comp
+            return loglik , g , h , lambdas
+
+        loglik , g , h , lambdas = e_step(mu , alpha , beta)
+        converged = False
+        it = 0
+        while it < max_iter:
+            it += 1
+            inv = 1.0 / lambdas
+            p_imm = mu * np.sum(inv)
+            p_off = alpha * np.sum(g * inv)
+            p_dist = -alpha * np.sum(h * inv)
+
+            mu = p_imm / T
+            if p_off > 0 and p_dist > 0:
+                beta = p_off / p_dist
+                branching = p_off / np.sum(1.0 - np.exp(-beta * s))
+                alpha = branching * beta
+            else:
+                alpha = 0.0
+
+            prev_ll = loglik
+            loglik , g , h , lambdas = e_step(mu , alpha , beta)
+            if abs(loglik - prev_ll) < tol * max(1.0 , abs(loglik)):
+                converged = True
+                break
+
+        res = OptimizeResult(
+            x=np.log(np.array([mu , max(alpha , 1e-300) , beta])),
+            fun=-loglik,
+            nit=it,
+            success=converged,
+            message="EM converged" if converged else "Maximum number of iterations reached",
+        )
+        res.result_params = {
+            "mu" : float(mu),
+            "alpha" : float(alpha),
+            "beta" : float(beta),
+        }
+        return res
+
+    def _beta_recursion(self , beta , cache_size):
+        """
+            Per-beta arrays for the profile: g_i and C = (1/beta) sum (1 - exp(-beta (T - t_i))).
+
+            Kept in a small LRU since each g is a full-length array.
+        """
+
+        if beta in self._beta_arrays:
+            self._beta_arrays.move_to_end(beta)
+            return self._beta_arrays[beta]
+
+        events = self.ll.events
+        g = self.ll._decay_sums(events , beta)
+        C = np.sum(1.0 - np.exp(-beta * (self.ll.T - events))) / beta
+        self._beta_arrays[beta] = (g , C)
+        while len(self._beta_arrays) > cache_size:
+            self._beta_arrays.popitem(last=False)
+        return g , C
+
+    def _profile_inner(self , g , C , mu , alpha , alpha_max , steps , tol = 1e-10):
+        """
+            Maximize L(mu , alpha) = sum log(mu + alpha g_i) - mu T - alpha C for fixed beta.
+
+            L is concave in (mu , alpha), so damped Newton from a warm start needs only a
+            few steps; alpha is kept in [0 , alpha_max] and mu > 0.
+
+            Returns:
+                tuple: (L , mu , alpha)
+        """
+
+        T = self.ll.T
+
+        def objective(mu , alpha):
+            lam = mu + alpha * g
+            if mu <= 0 or np.any(lam <= 0):
+                return -np.inf , lam
+            return np.sum(np.log(lam)) - mu * T - alpha * C , lam
+
+        val , lam = objective(mu , alpha)
+        for _ in range(steps):
+            w = 1.0 / lam
+            gw = g * w
+            grad = np.array([np.sum(w) - T , np.sum(gw) - C])
+            w2 = w * w
+            hess = -np.array([[np.sum(w2) , np.sum(g * w2)] , [np.sum(g * w2) , np.sum(gw * gw)]])
+            try:
+                step = -np.linalg.solve(hess , grad)
+            except np.linalg.LinAlgError:
+                step = grad / max(np.abs(np.diag(hess)).max() , 1e-300)
+
+            t = 1.0
+            while t > 1e-10:
+                mu_new = mu + t * step[0]
+                alpha_new = min(max(alpha + t * step[1] , 0.0) , alpha_max)
+                new_val , new_lam = objective(mu_new , alpha_new)
+                if new_val >= val:
+                    break
+                t *= 0.5
+            else:
+                break
+
+            gain = new_val - val
+            mu , alpha , val , lam = mu_new , alpha_new , new_val , new_lam
+            if gain < tol * max(1.0 , abs(val)):
+                break
+
+        return val , mu , alpha
+
+    def fit_profile(self , beta_bounds = None , xtol = 1e-4 , max_iter = 100 , newton_steps = 20 ,
+                    max_ratio = 0.999 , cache_size = 4):
+        """
+            Fit by profiling out (mu , alpha): golden-section search over beta only.
+
+            For fixed beta the log-likelihood is concave in (mu , alpha), so each
+            beta costs one recursion pass for g plus a few cheap Newton steps
+            (warm-started from the previous beta). The outer search runs on
+            log(beta); per-beta arrays and profile optima (keyed on beta and the
+            inner-solve settings) are cached on the instance so repeated fits
+            reuse them.
+
+            Args:
+                beta_bounds (tuple , optional): (low , high) search interval for beta.
+                    Defaults to (1e-3 , 1e3) times the event rate n/T
+                xtol (float): Stop when the log(beta) bracket is narrower than this
+                max_iter (int): Maximum golden-section iterations
+                newton_steps (int): Maximum Newton steps per inner solve
+                max_ratio (float): Inner solves keep alpha <= max_ratio * beta
+                cache_size (int): Number of per-beta g arrays kept in memory
+
+            Returns:
+                OptimizeResult: x (log-params) , fun (negative log-likelihood) , nit ,
+                    nfev (distinct betas evaluated) , success , result_params as in fit() ,
+                    profile (list of (beta , profile log-likelihood) visited by this search)
+        """
+
+        n = self.ll.n
+        T = self.ll.T
+        if n == 0:
+            raise ValueError("profile fit needs at least one event")
+        rate = n / T
+        if beta_bounds is None:
+            beta_bounds = (1e-3 * rate , 1e3 * rate)
+
+        warm = [0.5 * rate , 0.0]
+        passes = [0]
+        visited = {}
+
+        def profile(log_beta):
+            beta = float(np.exp(log_beta))
+            key = (beta , float(max_ratio) , int(newton_steps))
+            if key not in self._beta_profile:
+                g , C = self._beta_recursion(beta , cache_size)
+                passes[0] += 1
+                mu0 , alpha0 = warm
+                alpha0 = min(alpha0 , max_ratio * beta)
+                if alpha0 <= 0:
+                    alpha0 = 0.25 * beta
+                    mu0 = 0.5 * rate
+                self._beta_profile[key] = self._profile_inner(
+                    g , C , mu0 , alpha0 , max_ratio * beta , newton_steps
+                )
+            val , mu , alpha = visited[beta] = self._beta_profile[key]
+            warm[:] = [mu , alpha]
+            return val
+
+        gr = (np.sqrt(5.0) - 1.0) / 2.0
+        a , b = np.log(beta_bounds[0]) , np.log(beta_bounds[1])
+        c = b - gr * (b - a)
+        d = a + gr * (b - a)
+        fc , fd = profile(c) , profile(d)
+        it = 0
+        while b - a > xtol and it < max_iter:
+            it += 1
+            if fc >= fd:
+                b , d , fd = d , c , fc
+                c = b - gr * (b - a)
+                fc = profile(c)
+            else:
+                a , c , fc = c , d , fd
+                d = a + gr * (b - a)
+                fd = profile(d)
+
+        log_beta = c if fc >= fd else d
+        beta = float(np.exp(log_beta))
+        val , mu , alpha = visited[beta]
+
+        res = OptimizeResult(
+            x=np.log(np.array([mu , max(alpha , 1e-300) , beta])),
+            fun=-val,
+            nit=it,
+            nfev=passes[0],
+            success=b - a <= xtol,
+            message="Bracket below xtol" if b - a <= xtol else "Maximum number of iterations reached",
+        )
+        res.result_params = {
+            "mu" : float(mu),
+            "alpha" : float(alpha),
+            "beta" : beta,
+        }
+        res.profile = sorted((b_ , v[0]) for b_ , v in visited.items())
+        return res
+
+    def _multistart_points(self , n_starts , rng):
+        """
+            Starting points in log-space for fit_multistart.
+
+            The first start is the default x0; the rest are spread over the
+            event rate r = n/T: beta ~ r * logU(0.1 , 100), branching ratio
+            alpha/beta ~ U(0.05 , 0.9) and mu ~ r * (1 - alpha/beta) * U(0.5 , 1.5).
+
+            Returns:
+                np.ndarray: shape (n_starts , 3)
+        """
+
+        n = self.ll.n
+        rate = n / self.T if n > 0 and self.T > 0 else 1.0
+        beta = rate * np.exp(rng.uniform(np.log(0.1) , np.log(100.0) , size=n_starts))
+        ratio = rng.uniform(0.05 , 0.9 , size=n_starts)
+        mu = rate * (1.0 - ratio) * rng.uniform(0.5 , 1.5 , size=n_starts)
+        points = np.log(np.column_stack([mu , ratio * beta , beta]))
+        points[0] = np.log(np.array([0.1 , 0.1, 1.0]))
+        return points
+
+    def fit_multistart(self , n_starts = 8 , starts = None , method = "L-BFGS-B" , options = None ,
+                       n_workers = None , agree = 3 , tol = 1e-6 , seed = None):
+        """
+            Fit from several starting points in parallel and keep the best.
+
+            The sorted event array is copied once into shared memory; worker
+            processes attach to it and build their own FitModel, so nothing
+            per task is pickled except the starting point. Once `agree` finished
+            starts reach the best objective within relative tolerance `tol`, the
+            queued starts are cancelled and a shared stop flag aborts the running
+            ones at their next objective evaluation; only finished starts are reported.
+
+            Args:
+                n_starts (int): Number of random starting points (ignored if starts given)
+                starts (array-like , optional): Explicit starting points, shape (N , 3) in log-space
+                method (str): Optimization method passed to fit()
+                options (dict , optional): Options passed to fit()
+                n_workers (int , optional): Worker processes. Defaults to os.cpu_count();
+                    1 runs every start in this process
+                agree (int): Stop early once this many starts agree with the best
+                    (0 disables early stopping)
+                tol (float): Relative objective tolerance for agreement
+                seed (int , optional): Seed for generating starting points
+
+            Returns:
+                scipy.optimize.OptimizeResult: Best result, with .result_params as in fit() plus
+                    .starts (per-start summaries), .spread (min / max / std of each
+                    parameter and the objective over completed starts) and .n_agree
+        """
+
+        if starts is None:
+            starts = self._multistart_points(int(n_starts) , np.random.default_rng(seed))
+        starts = np.atleast_2d(np.asarray(starts , dtype=float))
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        n_workers = max(1 , min(int(n_workers) , len(starts)))
+
+        results = []
+
+        def agreed():
+            if agree <= 0 or len(results) < agree:
+                return False
+            best = min(r.fun for _ , r in results)
+            close = sum(abs(r.fun - best) <= tol * max(1.0 , abs(best)) for _ , r in results)
+            return close >= agree
+
+        if n_workers == 1:
+            for x0 in starts:
+                results.append((x0 , self.fit(x0=x0 , method=method , options=options)))
+                if agreed():
+                    break
+        else:
+            events = self.ll.events
+            shm = shared_memory.SharedMemory(create=True , size=max(events.nbytes , 1))
+            try:
+                np.ndarray(events.shape , dtype=np.float64 , buffer=shm.buf)[:] = events
+                ctx = multiprocessing.get_context()
+                stop = ctx.Event()
+                pool = ProcessPoolExecutor(
+                    max_workers=n_workers ,
+                    mp_context=ctx ,
+                    initializer=_init_multistart_worker ,
+                    initargs=(shm.name , len(events) , self.T , stop) ,
+                )
+                try:
+                    pending = {pool.submit(_run_multistart_start , x0 , method , options): x0
+                               for x0 in starts}
+                    while pending:
+                        done , _ = wait(pending , return_when=FIRST_COMPLETED)
+                        for fut in done:
+                            x0 = pending.pop(fut)
+                            results.append((x0 , fut.result()))
+                        if agreed():
+                            stop.set()
+                            for fut in pending:
+                                fut.cancel()
+                            break
+                finally:
+                    pool.shutdown(wait=True , cancel_futures=True)
+            finally:
+                shm.close()
+                shm.unlink()
+
+        best_x0 , best = min(results , key=lambda item: item[1].fun)
+        params = np.array([[r.result_params[k] for k in ("mu" , "alpha" , "beta")] for _ , r in results])
+        funs = np.array([r.fun for _ , r in results])
+
+        best.starts = [
+            {"x0": x0.tolist() , "params": r.result_params , "fun": float(r.fun) , "success": bool(r.success)}
+            for x0 , r in results
+        ]
+        best.spread = {
+            name: {"min": float(col.min()) , "max": float(col.max()) , "std": float(col.std())}
+            for name , col in zip(("mu" , "alpha" , "beta" , "fun") , np.column_stack([params , funs]).T)
+        }
+        best.n_agree = int(np.sum(np.abs(funs - best.fun) <= tol * max(1.0 , abs(best.fun))))
+        best.x0 = best_x0
+        return best
+
+
+# --- multi-start worker state (one FitModel per worker process) ---
+
+class _StartCancelled(Exception):
+    """Raised inside fit() when fit_multistart's stop flag is set."""
+
+
+_worker_shm = None
+_worker_fitter = None
+
+
+def _attach_shared_memory(name):
+    """
+    Attach to a segment owned by the parent without registering it with the
+    resource tracker, so the worker can never unlink it or report it leaked.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name , track=False)
+    except TypeError:
+        pass
+    # Python < 3.13 has no track argument and registers on attach. Calling
+    # resource_tracker.unregister afterwards would drop the parent's own entry
+    # (workers share its tracker), so skip the registration instead.
+    register = resource_tracker.register
+    resource_tracker.register = lambda name , rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _init_multistart_worker(shm_name , n , T , stop):
+    """Attach to the shared event buffer and build this worker's FitModel."""
+    global _worker_shm , _worker_fitter
+    _worker_shm = _attach_shared_memory(shm_name)
+    events = np.ndarray((n ,) , dtype=np.float64 , buffer=_worker_shm.buf)
+    events.flags.writeable = False  # the parent never writes it again, so use it without a copy
+    _worker_fitter = FitModel(events , T)
+    _worker_fitter._stop = stop
+
+
+def _run_multistart_start(x0 , method , options):
+    """One start; None if the parent's stop flag aborted it."""
+    try:
+        return _worker_fitter.fit(x0=x0 , method=method , options=options)
+    except _StartCancelled:
+        return None
@@ -0,0 +1,242 @@
+"""
+Tick-data ingest: CSV / Parquet trade files -> normalized event arrays.
+
+Only the timestamp column is read, in chunks, so memory is bounded by the
+output (8 bytes per trade) rather than by the file size. Timestamps are parsed
+vectorized into int64 nanoseconds (ISO strings through numpy's datetime64
+parser, numeric epochs by scaling); no per-row datetime objects are built.
+Epochs read from CSV text are parsed as integers (fractional text split at the
+decimal point), never through float, so ns / us epochs keep full precision.
+
+After reading, normalize_events():
+    - filters a trading session by UTC time of day, e.g. ("14:30" , "21:00")
+    - handles tied timestamps: keep, aggregate (one event per timestamp, with
+      counts), or jitter (ties spread evenly inside the timestamp resolution)
+    - rescales to [0 , T] in seconds (or `time_scale` units)
+
+and returns a contiguous float64 array ready for HawkesLikelihood.
+
+Parquet needs pyarrow; CSV uses pandas when installed and the csv module otherwise.
+"""
+
+
+import csv
+import itertools
+
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+_UNIT_NS = {"s": NS_PER_SECOND , "ms": 1_000_000 , "us": 1_000 , "ns": 1}
+
+
+def parse_timestamps(values , unit = None):
+    """
+    Vectorized timestamp parsing to int64 nanoseconds.
+
+    :param values: array-like of ISO-8601 strings / datetime64 values, or numeric epochs
+        (numbers or their text, e.g. straight from a CSV)
+    :param unit: epoch unit for numeric input ("s" , "ms" , "us" , "ns"); None for strings
+
+    returns:
+        np.ndarray: int64 nanoseconds since the epoch
+    """
+    values = np.asarray(values)
+    if unit is not None:
+        if unit not in _UNIT_NS:
+            raise ValueError(f"Unknown epoch unit {unit!r}; use one of {sorted(_UNIT_NS)}")
+        if values.dtype.kind in "USO":
+            return _parse_epoch_text(values , unit)
+        if unit == "ns" or np.issubdtype(values.dtype , np.integer):
+            return values.astype(np.int64) * _UNIT_NS[unit]
+        # float epochs: split whole and fractional parts to keep sub-unit precision
+        values = values.astype(float)
+        whole = np.floor(values)
+        return whole.astype(np.int64) * _UNIT_NS[unit] + np.round((values - whole) * _UNIT_NS[unit]).astype(np.int64)
+    if np.issubdtype(values.dtype , np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64)
+    return values.astype(str).astype("datetime64[ns]").astype(np.int64)
+
+
+def _parse_epoch_text(values , unit):
+    """Epoch text to int64 ns without going through float (which drops ns / us digits)."""
+    text = np.char.strip(values.astype(str))
+    if np.any(np.char.find(np.char.lower(text) , "e") >= 0):
+        # exponent notation: only float can read it
+        return parse_timestamps(text.astype(float) , unit)
+
+    parts = np.char.partition(text , ".")
+    whole , frac = parts[... , 0] , parts[... , 2]
+    negative = np.char.startswith(whole , "-")
+    scale = _UNIT_NS[unit]
+    out = np.char.lstrip(whole , "+-")
+    out = np.where(out == "" , "0" , out).astype(np.int64) * scale
+
+    digits = len(str(scale)) - 1  # fractional digits resolvable at 1 ns
+    if digits and np.any(frac != ""):
+        out = out + np.char.ljust(frac , digits , "0").astype(f"U{digits}").astype(np.int64)
+    return np.where(negative , -out , out)
+
+
+def _time_of_day_ns(text):
+    parts = [float(p) for p in text.split(":")]
+    parts += [0.0] * (3 - len(parts))
+    return int(round((parts[0] * 3600 + parts[1] * 60 + parts[2]) * NS_PER_SECOND))
+
+
+def _resolution_ns(ts):
+    """Largest power of ten (in ns, up to 1 s) dividing every timestamp."""
+    for exponent in range(9 , 0 , -1):
+        step = 10 ** exponent
+        if not np.any(ts % step):
+            return step
+    return 1
+
+
+def iter_timestamp_chunks(path , time_column = "timestamp" , unit = None , chunk_rows = 1_000_000 , fmt = None):
+    """
+    Yield int64-nanosecond timestamp chunks from a CSV or Parquet file.
+
+    :param path: file path; ".parquet" / ".pq" are read with pyarrow, anything else as CSV
+    :param time_column: name of the timestamp column
+    :param unit: epoch unit for numeric timestamps, None for ISO strings
+    :param chunk_rows: rows per chunk
+    :param fmt: "csv" or "parquet" to override detection by extension
+    """
+    path = str(path)
+    if fmt is None:
+        fmt = "parquet" if path.lower().endswith((".parquet" , ".pq")) else "csv"
+
+    if fmt == "parquet":
+        if pq is None:
+            raise ImportError("Reading Parquet needs pyarrow: pip install pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows , columns=[time_column]):
+            yield parse_timestamps(batch.column(0).to_numpy(zero_copy_only=False) , unit)
+        return
+
+    if pd is not None:
+        # read as text either way: numeric epochs are parsed by parse_timestamps without float rounding
+        for frame in pd.read_csv(path , usecols=[time_column] , dtype={time_column: str} , chunksize=chunk_rows):
+            yield parse_timestamps(frame[time_column].to_numpy() , unit)
+        return
+
+    with open(path , newline="") as fh:
+        reader = csv.reader(fh)
+        header = next(reader)
+        try:
+            col = header.index(time_column)
+        except ValueError:
+            raise ValueError(f"column {time_column!r} not in {header}") from None
+        while True:
+            rows = list(itertools.islice(reader , chunk_rows))
+            if not rows:
+                break
+            yield parse_timestamps(np.array([row[col] for row in rows]) , unit)
+
+
+def normalize_events(timestamps_ns , session = None , ties = "keep" , jitter = None , time_scale = 1.0):
+    """
+    Turn raw int64-nanosecond timestamps into sorted event times on [0 , T].
+
+    :param timestamps_ns: int64 nanoseconds (any order)
+    :param session: optional ("HH:MM[:SS]" , "HH:MM[:SS]") time-of-day window [start , end)
+        in UTC (timestamps are epoch ns, so give local exchange hours converted to UTC);
+        the origin is the first day's session start, and multi-day inputs keep the gaps between sessions
+    :param ties: "keep" , "aggregate" (unique timestamps plus counts) or "jitter"
+    :param jitter: width in seconds over which "jitter" spreads k tied events
+        (at offsets width * i / k); defaults to the timestamp resolution (e.g. 1 ms)
+        and is clamped to the gap before the next distinct timestamp, so order is kept
+    :param time_scale: output units per second (1.0 = seconds, 1e3 = milliseconds)
+
+    returns:
+        dict: {"events" , "T" , "n_raw" , "n" , "origin_ns" , "counts" (aggregate only)}
+    """
+    ts = np.asarray(timestamps_ns , dtype=np.int64)
+    n_raw = len(ts)
+    if np.any(ts[1:] < ts[:-1]):
+        ts = np.sort(ts)
+
+    origin = int(ts[0]) if len(ts) else 0
+    end = int(ts[-1]) if len(ts) else 0
+    if session is not None:
+        start_tod , end_tod = (_time_of_day_ns(x) for x in session)
+        tod = ts % NS_PER_DAY
+        ts = ts[(tod >= start_tod) & (tod < end_tod)]
+        if len(ts):
+            origin = int(ts[0] - ts[0] % NS_PER_DAY + start_tod)
+            end = int(ts[-1] - ts[-1] % NS_PER_DAY + end_tod)
+
+    if ties not in ("keep" , "aggregate" , "jitter"):
+        raise ValueError(f"Unknown ties mode {ties!r}; use keep, aggregate or jitter")
+    counts = None
+    if ties == "aggregate":
+        ts , counts = np.unique(ts , return_counts=True)
+    offsets_ns = np.zeros(len(ts))
+    if ties == "jitter" and len(ts) > 1:
+        new_group = np.concatenate([[True] , ts[1:] != ts[:-1]])
+        starts = np.flatnonzero(new_group)
+        group_size = np.diff(np.append(starts , len(ts)))
+        rank = np.arange(len(ts)) - np.repeat(starts , group_size)
+        if jitter is None:
+            width_ns = float(_resolution_ns(ts))
+        else:
+            width_ns = jitter * NS_PER_SECOND
+        gap_ns = np.append(np.diff(ts[starts]) , np.inf)
+        width_ns = np.minimum(width_ns , gap_ns)
+        offsets_ns = np.repeat(width_ns / group_size , group_size) * rank
+
+    scale = time_scale / NS_PER_SECOND
+    events = np.ascontiguousarray(((ts - origin) + offsets_ns) * scale , dtype=np.float64)
+    T = max((end - origin) * scale , float(events[-1]) if len(events) else 0.0)
+
+    out = {"events": events , "T": T , "n_raw": n_raw , "n": len(events) , "origin_ns": origin}
+    if counts is not None:
+        out["counts"] = counts
+    return out
+
+
+def load_ticks(path , time_column = "timestamp" , unit = None , chunk_rows = 1_000_000 , fmt = None ,
+               session = None , ties = "keep" , jitter = None , time_scale = 1.0):
+    """
+    Stream a trade file into a normalized event array.
+
+    Chunks are parsed as they are read and appended into one growing int64
+    buffer, so peak memory is about two timestamp arrays regardless of how
+    many other columns the file has. See iter_timestamp_chunks and
+    normalize_events for the parameters.
+
+    returns:
+        dict: normalize_events output plus "options" (the preprocessing settings used)
+    """
+    buffer = np.empty(0 , dtype=np.int64)
+    size = 0
+    for chunk in iter_timestamp_chunks(path , time_column=time_column , unit=unit ,
+                                       chunk_rows=chunk_rows , fmt=fmt):
+        if size + len(chunk) > len(buffer):
+            grown = np.empty(max(2 * len(buffer) , size + len(chunk)) , dtype=np.int64)
+            grown[:size] = buffer[:size]
+            buffer = grown
+        buffer[size:size + len(chunk)] = chunk
+        size += len(chunk)
+
+    out = normalize_events(buffer[:size] , session=session , ties=ties , jitter=jitter , time_scale=time_scale)
+    out["options"] = {
+        "time_column": time_column,
+        "unit": unit,
+        "session": list(session) if session is not None else None,
+        "ties": ties,
+        "jitter": jitter,
+        "time_scale": time_scale,
+    }
+    return out
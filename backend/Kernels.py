@@ -0,0 +1,284 @@
+"""
+Exponential-kernel recursion backends.
+
+Everything in the Hawkes code that walks the events with an exponential kernel
+reduces to the same O(n) recursion over sorted event times:
+
+    g_0 = 0
+    g_i = exp(-beta * (t_i - t_{i-1})) * (1 + g_{i-1})  =  sum_{j < i} exp(-beta (t_i - t_j))
+
+This module provides interchangeable implementations of it:
+    - "python": plain scalar loop (reference)
+    - "numpy": vectorized within blocks of events, no per-event Python work
+    - "numba": JIT-compiled loop, only if numba is installed
+
+get_decay_sums() picks numba when available and falls back to numpy.
+
+For gradients the same pass also carries the beta-derivatives
+    h_i = dg_i/dbeta     = -sum_{j < i} (t_i - t_j) exp(-beta (t_i - t_j))
+    k_i = d^2g_i/dbeta^2 =  sum_{j < i} (t_i - t_j)^2 exp(-beta (t_i - t_j))
+with h_i = d_i (h_{i-1} - dt_i (1 + g_{i-1})) and
+k_i = d_i (k_{i-1} - 2 dt_i h_{i-1} + dt_i^2 (1 + g_{i-1})), d_i = exp(-beta dt_i).
+get_decay_derivs() returns (g , h , k) with the same backend choice.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# Largest beta * (t_last - t_first) a block may span before exp() overflows
+_MAX_BLOCK_SPAN = 500.0
+
+
+def _span_blocks(events , beta , block , max_span):
+    """
+    (start , stop) index pairs covering the sorted events, each with at most
+    `block` events and beta * (t_last - t_first) < max_span, so the rescaled
+    cumsums below never overflow. Blocks are cut every `block` events and at
+    every multiple of max_span / beta in time; the boundaries are computed in
+    one vectorized pass.
+    """
+    n = len(events)
+    if n == 0:
+        return []
+    bins = np.floor((beta / max_span) * (events - events[0]))
+    starts = np.union1d(np.arange(0 , n , block) , np.flatnonzero(bins[1:] != bins[:-1]) + 1)
+    bounds = np.append(starts , n).tolist()
+    return zip(bounds[:-1] , bounds[1:])
+
+
+def decay_sums_python(events , beta):
+    """
+    Reference scalar loop for g_i = sum_{j < i} exp(-beta (t_i - t_j)).
+
+    :param events (np.ndarray): sorted event times
+    :param beta (float): decay rate (> 0)
+
+    returns:
+        np.ndarray: g, same length as events
+    """
+    n = len(events)
+    g = np.zeros(n , dtype=float)
+    g_prev = 0.0
+    for i in range(1 , n):
+        g_prev = math.exp(-beta * (events[i] - events[i-1])) * (1.0 + g_prev)
+        g[i] = g_prev
+    return g
+
+
+def decay_sums_numpy(events , beta , block=512):
+    """
+    Vectorized g_i = sum_{j < i} exp(-beta (t_i - t_j)).
+
+    Within a block, with x = beta * (t - t_first) and carry = g_first + 1 decayed
+    from the previous block, 1 + g_i = exp(-x_i) * (carry + cumsum(exp(x_j)))
+    over the block's events j <= i. The decays are computed for a whole block in
+    one shot. Blocks are cut where beta * span passes _MAX_BLOCK_SPAN, so exp(x)
+    cannot overflow and the carry restarts the rescaled cumsum there.
+
+    :param events (np.ndarray): sorted event times
+    :param beta (float): decay rate (> 0)
+    :param block (int): max events per vectorized block
+
+    returns:
+        np.ndarray: g, same length as events
+    """
+    events = np.asarray(events , dtype=float)
+    n = len(events)
+    post = np.empty(n , dtype=float)  # 1 + g_i, the sum including event i itself
+    carry = 0.0
+    t_prev = events[0] if n else 0.0
+
+    for start , stop in _span_blocks(events , beta , block , _MAX_BLOCK_SPAN):
+        seg = events[start:stop]
+        carry *= math.exp(-beta * (seg[0] - t_prev))
+        decay = np.exp(-beta * (seg - seg[0]))
+        post[start:stop] = decay * (carry + np.cumsum(1.0 / decay))
+        carry = post[stop - 1]
+        t_prev = seg[-1]
+
+    return post - 1.0
+
+
+if njit is not None:
+    @njit
+    def _decay_sums_numba(events , beta):
+        n = events.shape[0]
+        g = np.zeros(n)
+        g_prev = 0.0
+        for i in range(1 , n):
+            g_prev = math.exp(-beta * (events[i] - events[i-1])) * (1.0 + g_prev)
+            g[i] = g_prev
+        return g
+
+    def decay_sums_numba(events , beta):
+        """JIT-compiled g_i = sum_{j < i} exp(-beta (t_i - t_j))."""
+        return _decay_sums_numba(np.ascontiguousarray(events , dtype=np.float64) , float(beta))
+else:
+    decay_sums_numba = None
+
+
+def decay_derivs_python(events , beta):
+    """
+    Reference scalar loop for g and its beta-derivatives h , k.
+
+    :param events (np.ndarray): sorted event times
+    :param beta (float): decay rate (> 0)
+
+    returns:
+        tuple: (g , h , k) arrays, same length as events
+    """
+    n = len(events)
+    g = np.zeros(n , dtype=float)
+    h = np.zeros(n , dtype=float)
+    k = np.zeros(n , dtype=float)
+    g_prev = h_prev = k_prev = 0.0
+    for i in range(1 , n):
+        dt = events[i] - events[i-1]
+        d = math.exp(-beta * dt)
+        G = 1.0 + g_prev
+        k_prev = d * (k_prev - 2.0 * dt * h_prev + dt * dt * G)
+        h_prev = d * (h_prev - dt * G)
+        g_prev = d * G
+        g[i] = g_prev
+        h[i] = h_prev
+        k[i] = k_prev
+    return g , h , k
+
+
+def decay_derivs_numpy(events , beta , block=512):
+    """
+    Vectorized g and its beta-derivatives h , k.
+
+    Same blocking as decay_sums_numpy. With u = t - t_first and weights
+    w = exp(beta u), the in-block sums are cumsums of w and of the moments
+    sum_j (u_i - u_j) w_j , sum_j (u_i - u_j)^2 w_j, accumulated from their
+    positive increments (no subtraction of large block-relative terms);
+    the carried state (1 + g , h , k) decays over a gap D as
+    (G , H , K) -> exp(-beta D) (G , H - D G , K - 2 D H + D^2 G).
+
+    :param events (np.ndarray): sorted event times
+    :param beta (float): decay rate (> 0)
+    :param block (int): max events per vectorized block
+
+    returns:
+        tuple: (g , h , k) arrays, same length as events
+    """
+    events = np.asarray(events , dtype=float)
+    n = len(events)
+    G_out = np.empty(n , dtype=float)
+    H_out = np.empty(n , dtype=float)
+    K_out = np.empty(n , dtype=float)
+    G = H = K = 0.0
+    t_prev = events[0] if n else 0.0
+
+    for start , stop in _span_blocks(events , beta , block , _MAX_BLOCK_SPAN):
+        seg = events[start:stop]
+        D = seg[0] - t_prev
+        d = math.exp(-beta * D)
+        G , H , K = d * G , d * (H - D * G) , d * (K - 2.0 * D * H + D * D * G)
+        u = seg - seg[0]
+
+        # M1_i = sum_{j <= i} (u_i - u_j) w_j , M2_i = sum_{j <= i} (u_i - u_j)^2 w_j built
+        # from positive increments, so nothing cancels however wide the block
+        w = np.exp(beta * u)
+        e = 1.0 / w
+        S0 = np.cumsum(w)
+        du = np.diff(u)
+        M1 = np.zeros(len(seg))
+        M2 = np.zeros(len(seg))
+        np.cumsum(du * S0[:-1] , out=M1[1:])
+        np.cumsum(du * (2.0 * M1[:-1] + du * S0[:-1]) , out=M2[1:])
+        G_out[start:stop] = e * (G + S0)
+        H_out[start:stop] = e * (H - u * G - M1)
+        K_out[start:stop] = e * (K - 2.0 * u * H + u * u * G + M2)
+
+        G = G_out[stop - 1]
+        H = H_out[stop - 1]
+        K = K_out[stop - 1]
+        t_prev = seg[-1]
+
+    return G_out - 1.0 , H_out , K_out
+
+
+if njit is not None:
+    @njit
+    def _decay_derivs_numba(events , beta):
+        n = events.shape[0]
+        g = np.zeros(n)
+        h = np.zeros(n)
+        k = np.zeros(n)
+        g_prev = 0.0
+        h_prev = 0.0
+        k_prev = 0.0
+        for i in range(1 , n):
+            dt = events[i] - events[i-1]
+            d = math.exp(-beta * dt)
+            G = 1.0 + g_prev
+            k_prev = d * (k_prev - 2.0 * dt * h_prev + dt * dt * G)
+            h_prev = d * (h_prev - dt * G)
+            g_prev = d * G
+            g[i] = g_prev
+            h[i] = h_prev
+            k[i] = k_prev
+        return g , h , k
+
+    def decay_derivs_numba(events , beta):
+        """JIT-compiled g and its beta-derivatives h , k."""
+        return _decay_derivs_numba(np.ascontiguousarray(events , dtype=np.float64) , float(beta))
+else:
+    decay_derivs_numba = None
+
+
+BACKENDS = {
+    "python": decay_sums_python,
+    "numpy": decay_sums_numpy,
+}
+DERIV_BACKENDS = {
+    "python": decay_derivs_python,
+    "numpy": decay_derivs_numpy,
+}
+if decay_sums_numba is not None:
+    BACKENDS["numba"] = decay_sums_numba
+    DERIV_BACKENDS["numba"] = decay_derivs_numba
+
+
+def get_decay_sums(backend=None):
+    """
+    Return the decay-sum implementation for `backend`.
+
+    :param backend (str , optional): "python", "numpy", "numba" or None / "auto"
+        for the fastest one available.
+
+    returns:
+        callable: f(events , beta) -> np.ndarray
+    """
+    if backend is None or backend == "auto":
+        return BACKENDS.get("numba" , decay_sums_numpy)
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown kernel backend {backend!r}; available: {sorted(BACKENDS)}"
+        )
+    return BACKENDS[backend]
+
+
+def get_decay_derivs(backend=None):
+    """
+    Return the (g , h , k) implementation for `backend`, see get_decay_sums.
+
+    returns:
+        callable: f(events , beta) -> (g , h , k)
+    """
+    if backend is None or backend == "auto":
+        return DERIV_BACKENDS.get("numba" , decay_derivs_numpy)
+    if backend not in DERIV_BACKENDS:
+        raise ValueError(
+            f"Unknown kernel backend {backend!r}; available: {sorted(DERIV_BACKENDS)}"
+        )
+    return DERIV_BACKENDS[backend]
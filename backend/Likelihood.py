@@ -11,6 +11,11 @@ This module provides the HawkesLikelihood class which computes:
 
 import numpy as np
 
+try:
+    from backend.Kernels import get_decay_sums, get_decay_derivs, _MAX_BLOCK_SPAN, _span_blocks
+except ImportError:
+    from Kernels import get_decay_sums, get_decay_derivs, _MAX_BLOCK_SPAN, _span_blocks
+
 class HawkesLikelihood:
     """
     Log-Likelihood for univariate hawkes process with exponential kernel.
@@ -21,19 +26,30 @@ class HawkesLikelihood:
         events (nd.ndarray): Event times in [0 , T]
         T (float) : Terminal time
         n (int) : Number of events
+        backend (str) : Kernel backend name ("auto" picks numba, else numpy)
     """
 
-    def __init__(self , events , T):
+    def __init__(self , events , T , backend=None):
         """
         Initialize likelihood computation
         
-        :param events: Event times, must be sorted and in [0 , T]
+        :param events: Event times in [0 , T]; sorted read-only float64 arrays
+            (np.memmap opened with mode "r", shared memory marked non-writeable)
+            are used as-is, anything else is copied so later edits by the
+            caller cannot change the likelihood
         :param T: Terminal time > 0
+        :param backend: Kernel backend for the recursion, see Kernels.get_decay_sums
         """
 
-        self.events = np.sort(np.array(events , dtype = float))
+        events = np.asarray(events , dtype = float)
+        if events.ndim != 1 or events.flags.writeable or np.any(events[1:] < events[:-1]):
+            events = np.sort(np.array(events , dtype = float).ravel())
+        self.events = events
         self.T = float(T)
         self.n = len(self.events)
+        self.backend = "auto" if backend is None else backend
+        self._decay_sums = get_decay_sums(backend)
+        self._decay_derivs = get_decay_derivs(backend)
 
     def log_likelihood(self , mu , alpha , beta , eps = 1e-12):
         """
@@ -64,18 +80,9 @@ class HawkesLikelihood:
 
         # Compute lambdas at event times using O(n) recurrsion
         #g_i = sum_{j < i} exp(-beta (t_i - t_j))
-        #recurrsion: g_i = exp(-beta * dy) * (i + g_{i-1})
-
-        lambdas = np.empty(n , dtype=float)
-        g_prev = 0.0
-        lambdas[0] = mu # no past events for first event
-
-        for i in range(1 , n):
-            dt = events[i] - events[i-1]
-            g_i = np.exp(-beta * dt) * (1.0 + g_prev)
-            lambdas[i] = mu + alpha * g_i
-
-            g_prev = g_i
+        #recurrsion: g_i = exp(-beta * dy) * (1 + g_{i-1})
+        g = self._decay_sums(events , beta)
+        lambdas = mu + alpha * g
 
         #Safegaurd: intensities must be positive
         if np.any(lambdas <= 0 ):
@@ -87,4 +94,140 @@ class HawkesLikelihood:
         # Integral term : mu T + (alpha / beta) sum_i(i - exp(-beta (T - t_i)))
         integral = mu * self.T + (alpha/beta) * np.sum(1.0  -np.exp(- beta * (self.T - events)))
 
-        return logsum - integral
\ No newline at end of file
+        return logsum - integral
+
+    def log_likelihood_and_gradient(self , mu , alpha , beta , hessian = False , eps = 1e-12):
+        """
+        Log-likelihood and its exact gradient w.r.t. (mu , alpha , beta) in one O(n) pass.
+
+        With lambda_i = mu + alpha g_i, h_i = dg_i/dbeta, k_i = d^2g_i/dbeta^2 and
+        E_i = exp(-beta (T - t_i)):
+
+            dL/dmu    = sum 1/lambda_i - T
+            dL/dalpha = sum g_i/lambda_i - (1/beta) sum (1 - E_i)
+            dL/dbeta  = alpha sum h_i/lambda_i + (alpha/beta^2) sum (1 - E_i)
+                        - (alpha/beta) sum (T - t_i) E_i
+
+        :param mu: (float) : Baseline intensity (must be > 0)
+        :param alpha (float): Jump amplitude (must be >= 0)
+        :param beta (float): Decay rate (must be > 0 )
+        :param hessian (bool): also return the 3x3 Hessian
+        :param eps (float): small constant to avoid log(0)
+
+        returns:
+        tuple: (L , grad) or (L , grad , hess); L = -inf and NaN derivatives if invalid
+        """
+
+        if mu <= 0 or alpha < 0 or beta <= 0:
+            nan_grad = np.full(3 , np.nan)
+            if hessian:
+                return -np.inf , nan_grad , np.full((3 , 3) , np.nan)
+            return -np.inf , nan_grad
+
+        T = self.T
+        events = self.events
+        g , h , k = self._decay_derivs(events , beta)
+        lambdas = mu + alpha * g  # > 0 since mu > 0 and g >= 0
+
+        s = T - events
+        E = np.exp(-beta * s)
+        one_minus_E = np.sum(1.0 - E)
+        sE = np.sum(s * E)
+        inv = 1.0 / lambdas
+
+        loglik = np.sum(np.log(lambdas + eps)) - mu * T - (alpha / beta) * one_minus_E
+        grad = np.array([
+            np.sum(inv) - T,
+            np.sum(g * inv) - one_minus_E / beta,
+            alpha * np.sum(h * inv) + (alpha / beta**2) * one_minus_E - (alpha / beta) * sE,
+        ])
+        if not hessian:
+            return loglik , grad
+
+        inv2 = inv * inv
+        s2E = np.sum(s * s * E)
+        # second derivative of the compensator term (1/beta) sum (1 - E_i) w.r.t. beta
+        comp_bb = 2.0 * one_minus_E / beta**3 - 2.0 * sE / beta**2 - s2E / beta
+        H = np.empty((3 , 3))
+        H[0 , 0] = -np.sum(inv2)
+        H[0 , 1] = H[1 , 0] = -np.sum(g * inv2)
+        H[0 , 2] = H[2 , 0] = -alpha * np.sum(h * inv2)
+        H[1 , 1] = -np.sum(g * g * inv2)
+        H[1 , 2] = H[2 , 1] = (np.sum(h * inv) - alpha * np.sum(g * h * inv2)
+                               + one_minus_E / beta**2 - sE / beta)
+        H[2 , 2] = alpha * np.sum(k * inv) - alpha**2 * np.sum(h * h * inv2) - alpha * comp_bb
+        return loglik , grad , H
+
+    def log_likelihood_grid(self , mu , alpha , beta , eps = 1e-12 , chunk_size = 2**22):
+        """
+        Log-likelihood for many parameter triples in a single pass over the events.
+
+        mu , alpha , beta are broadcast against each other, so either pass
+        equal-length arrays of triples or open meshgrids, e.g.
+        log_likelihood_grid(mus[: , None] , alphas[None , :] , beta) for a
+        (mu , alpha) surface. The recursion state is a vector over the distinct
+        betas and is advanced block by block through the events; every parameter
+        with the same beta reuses it. Working arrays are capped at about
+        `chunk_size` floats by chunking parameters and events.
+
+        :param mu: Baseline intensities (array-like)
+        :param alpha: Jump amplitudes (array-like)
+        :param beta: Decay rates (array-like)
+        :param eps (float): small constant to avoid log(0)
+        :param chunk_size (int): max elements in the per-block work arrays
+
+        returns:
+        np.ndarray: log-likelihoods with the broadcast shape; -inf where invalid
+        """
+
+        mu , alpha , beta = np.broadcast_arrays(
+            np.asarray(mu , dtype=float) , np.asarray(alpha , dtype=float) , np.asarray(beta , dtype=float)
+        )
+        shape = mu.shape
+        mu , alpha , beta = mu.ravel() , alpha.ravel() , beta.ravel()
+        out = np.full(mu.shape , -np.inf)
+
+        valid = (mu > 0) & (alpha >= 0) & (beta > 0)
+        if self.n == 0:
+            out[valid] = -mu[valid] * self.T
+            return out.reshape(shape)
+
+        idx = np.flatnonzero(valid)
+        n_chunk = max(1 , min(len(idx) , chunk_size // 64))
+        for start in range(0 , len(idx) , n_chunk):
+            sel = idx[start:start + n_chunk]
+            out[sel] = self._log_likelihood_chunk(mu[sel] , alpha[sel] , beta[sel] , eps , chunk_size)
+
+        return out.reshape(shape)
+
+    def _log_likelihood_chunk(self , mu , alpha , beta , eps , chunk_size):
+        """log_likelihood_grid for one chunk of valid parameters (1-D arrays)."""
+
+        events = self.events
+        T = self.T
+        betas , which = np.unique(beta , return_inverse=True)
+        block = max(64 , chunk_size // len(mu))
+
+        logsum = np.zeros(len(mu))
+        compensator = np.zeros(len(betas))  # sum_i (1 - exp(-beta (T - t_i))) per beta
+        carry = np.zeros(len(betas))  # 1 + g at the previous event, per beta
+        t_prev = events[0]
+
+        # blocks are cut where the largest beta's span passes _MAX_BLOCK_SPAN, so the
+        # rescaled cumsum below never overflows for any beta in the chunk
+        for start , stop in _span_blocks(events , betas[-1] , block , _MAX_BLOCK_SPAN):
+            seg = events[start:stop]
+            carry *= np.exp(-betas * (seg[0] - t_prev))
+            decay = np.exp(-betas[: , None] * (seg - seg[0])[None , :])
+            post = decay * (carry[: , None] + np.cumsum(1.0 / decay , axis=1))
+
+            # g_i excludes event i itself
+            g = post[which] - 1.0
+            logsum += np.sum(np.log(mu[: , None] + alpha[: , None] * g + eps) , axis=1)
+            compensator += np.sum(1.0 - np.exp(-betas[: , None] * (T - seg)[None , :]) , axis=1)
+
+            carry = post[: , -1]
+            t_prev = seg[-1]
+
+        integral = mu * T + (alpha / beta) * compensator[which]
+        return logsum - integral
@@ -0,0 +1,171 @@
+"""
+Lightweight timing instrumentation: stage timers, counters and histograms.
+
+    StageTimer   named stage durations for one request, rendered as a
+                 Server-Timing header ("simulate;dur=12.31, plots;dur=80.02")
+    Counter      monotonically increasing value per label set
+    Histogram    cumulative-bucket latency histogram per label set
+    REGISTRY     default registry; REGISTRY.render() is the Prometheus text format
+
+No external dependency. Recording is a perf_counter() pair and a dict update
+under a lock, so the overhead per request is a few microseconds. Set the
+environment variable LAMBDALAB_METRICS=0 to switch instrumentation off
+(ENABLED is False; the API then sends no Server-Timing headers and no /metrics).
+"""
+
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+ENABLED = os.environ.get("LAMBDALAB_METRICS" , "1").strip().lower() not in ("0" , "false" , "off" , "no")
+
+DEFAULT_BUCKETS = (0.001 , 0.0025 , 0.005 , 0.01 , 0.025 , 0.05 , 0.1 , 0.25 , 0.5 , 1.0 , 2.5 , 5.0 , 10.0 , 30.0 , 60.0)
+
+
+def _format_labels(labels , extra = None):
+    items = list(labels) + ([extra] if extra is not None else [])
+    if not items:
+        return ""
+    body = ",".join(f'{k}="{str(v)}"'.replace("\n" , " ") for k , v in items)
+    return "{" + body + "}"
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self.metrics = []
+        self.lock = threading.Lock()
+
+    def register(self , metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            for metric in self.metrics:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class Counter:
+    """
+    Counter with labels.
+
+    Attributes:
+        name (str): Metric name
+        help (str): Description
+    """
+
+    kind = "counter"
+
+    def __init__(self , name , help , registry = REGISTRY):
+        self.name = name
+        self.help = help
+        self._lock = registry.lock
+        self._values = {}
+        registry.register(self)
+
+    def inc(self , amount = 1.0 , **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key , 0.0) + amount
+
+    def value(self , **labels):
+        return self._values.get(tuple(sorted(labels.items())) , 0.0)
+
+    def samples(self):
+        return [f"{self.name}{_format_labels(key)} {value!r}" for key , value in self._values.items()]
+
+
+class Histogram:
+    """
+    Histogram with labels and fixed upper bucket bounds (seconds by default).
+
+    Attributes:
+        name (str): Metric name
+        help (str): Description
+        buckets (tuple): Sorted upper bounds; +Inf is implicit
+    """
+
+    kind = "histogram"
+
+    def __init__(self , name , help , buckets = DEFAULT_BUCKETS , registry = REGISTRY):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._lock = registry.lock
+        self._values = {}  # labels -> [per-bucket counts (non-cumulative) , sum , count]
+        registry.register(self)
+
+    def observe(self , value , **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets) , 0.0 , 0]
+            for i , bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self , **labels):
+        entry = self._values.get(tuple(sorted(labels.items())))
+        return entry[2] if entry else 0
+
+    def samples(self):
+        out = []
+        for key , (counts , total , n) in self._values.items():
+            cumulative = 0
+            for bound , c in zip(self.buckets , counts):
+                cumulative += c
+                out.append(f"{self.name}_bucket{_format_labels(key , ('le' , repr(bound)))} {cumulative}")
+            out.append(f"{self.name}_bucket{_format_labels(key , ('le' , '+Inf'))} {n}")
+            out.append(f"{self.name}_sum{_format_labels(key)} {total!r}")
+            out.append(f"{self.name}_count{_format_labels(key)} {n}")
+        return out
+
+
+class StageTimer:
+    """
+    Named stage durations (seconds) for one unit of work, in recording order.
+
+    Attributes:
+        stages (list): (name , seconds) pairs
+    """
+
+    def __init__(self):
+        self.stages = []
+
+    @contextmanager
+    def stage(self , name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name , time.perf_counter() - started))
+
+    def add(self , name , seconds):
+        self.stages.append((name , seconds))
+
+    def extend(self , stages):
+        self.stages.extend((name , seconds) for name , seconds in stages)
+
+    def total(self):
+        return sum(seconds for _ , seconds in self.stages)
+
+    def server_timing(self):
+        """Server-Timing header value, durations in milliseconds."""
+        return ", ".join(f"{name};dur={seconds * 1000.0:.2f}" for name , seconds in self.stages)
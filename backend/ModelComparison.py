@@ -41,11 +41,16 @@ class ModelComparison:
         Initialize model comparison framework.
 
         Args:
-            events (array-like): Event times in [0 , T] must be sorted
+            events (array-like): Event times in [0 , T]; sorted read-only float64
+                arrays (e.g. a mode "r" np.memmap) are used without copying, anything
+                else is copied
             T (float): Terminal time > 0
         """
 
-        self.events = np.sort(np.array(events , dtype = float))
+        events = np.asarray(events , dtype = float)
+        if events.ndim != 1 or events.flags.writeable or np.any(events[1:] < events[:-1]):
+            events = np.sort(np.array(events , dtype = float).ravel())
+        self.events = events
         self.T = float(T)
         self.n = len(self.events)
     
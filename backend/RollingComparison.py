@@ -0,0 +1,129 @@
+"""
+Rolling / sliding-window Poisson vs Hawkes comparison over a trading day.
+
+Runs ModelComparison.compare on windows [s , s + window] stepped by `step`
+over one sorted event buffer. Window bounds are found with searchsorted, each
+window's Hawkes fit is warm-started from the previous window's estimate, and
+contiguous blocks of windows run in parallel worker processes (warm starts
+chain within a block). Output is columnar: one numpy array per field.
+"""
+
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    from backend.ModelComparison import ModelComparison
+except ImportError:
+    from ModelComparison import ModelComparison
+
+
+COLUMNS = ("start" , "end" , "n" , "mu" , "alpha" , "beta" , "branching_ratio" ,
+           "loglik_poisson" , "loglik_hawkes" , "delta_aic")
+
+
+def _compare_window_block(events , starts , lo , hi , window , method , options , min_events):
+    """
+    Compare a contiguous run of windows, warm-starting each fit from the last.
+
+    `events` holds only the slice covering this block; lo / hi index into it.
+    """
+
+    out = {name: np.full(len(starts) , np.nan) for name in COLUMNS}
+    out["start"] = np.asarray(starts , dtype=float)
+    out["end"] = out["start"] + window
+    out["n"] = (hi - lo).astype(float)
+
+    x0 = None
+    for k , (s , a , b) in enumerate(zip(starts , lo , hi)):
+        if b - a < min_events:
+            continue
+        result = ModelComparison(events[a:b] - s , window).compare(x0=x0 , method=method , options=options)
+        hawkes = result["hawkes"]
+        out["loglik_poisson"][k] = result["poisson"]["loglik"]
+        out["loglik_hawkes"][k] = hawkes["loglik"]
+        out["delta_aic"][k] = result["delta_aic"]
+        if hawkes["fit_result"] is None or not np.isfinite(hawkes["loglik"]):
+            continue
+        out["mu"][k] = hawkes["mu"]
+        out["alpha"][k] = hawkes["alpha"]
+        out["beta"][k] = hawkes["beta"]
+        out["branching_ratio"][k] = hawkes["alpha"] / hawkes["beta"]
+        x0 = np.log(np.array([hawkes["mu"] , hawkes["alpha"] , hawkes["beta"]]))
+    return out
+
+
+class RollingComparison:
+    """
+    Sliding-window model comparison sharing one sorted event buffer.
+
+    Attributes:
+        events (np.ndarray): Sorted event times
+        T (float): Terminal time
+    """
+
+    def __init__(self , events , T):
+        """
+        Args:
+            events (array-like): Event times in [0 , T]; sorted float64 arrays are used without copying
+            T (float): Terminal time > 0
+        """
+
+        events = np.asarray(events , dtype=float)
+        if events.ndim != 1 or np.any(events[1:] < events[:-1]):
+            events = np.sort(events.ravel())
+        self.events = events
+        self.T = float(T)
+
+    def windows(self , window , step , start = 0.0):
+        """
+        Window start times and their [lo , hi) index bounds into self.events.
+
+        returns:
+            tuple: (starts , lo , hi)
+        """
+        starts = np.arange(float(start) , self.T - window + 1e-12 , step)
+        lo = np.searchsorted(self.events , starts , side="left")
+        hi = np.searchsorted(self.events , starts + window , side="right")
+        return starts , lo , hi
+
+    def run(self , window , step , start = 0.0 , method = "L-BFGS-B" , options = None ,
+            n_workers = None , min_events = 10):
+        """
+        Fit and compare both models on every window.
+
+        Args:
+            window (float): Window length
+            step (float): Distance between consecutive window starts
+            start (float): First window start
+            method (str): Optimization method for the Hawkes fits
+            options (dict , optional): Optimizer options
+            n_workers (int , optional): Worker processes (default os.cpu_count(); 1 = in-process)
+            min_events (int): Windows with fewer events are left as NaN
+
+        returns:
+            dict: column name -> np.ndarray, see COLUMNS
+        """
+
+        starts , lo , hi = self.windows(window , step , start)
+        if len(starts) == 0:
+            return {name: np.empty(0) for name in COLUMNS}
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        n_blocks = max(1 , min(int(n_workers) , len(starts)))
+
+        jobs = []
+        for idx in np.array_split(np.arange(len(starts)) , n_blocks):
+            first , last = lo[idx[0]] , hi[idx[-1]]
+            jobs.append((self.events[first:last] , starts[idx] , lo[idx] - first , hi[idx] - first ,
+                         window , method , options , min_events))
+
+        if n_blocks == 1:
+            parts = [_compare_window_block(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=n_blocks) as pool:
+                parts = list(pool.map(_compare_window_block , *zip(*jobs)))
+
+        return {name: np.concatenate([part[name] for part in parts]) for name in COLUMNS}
@@ -3,30 +3,50 @@ Simulation engine for Poissons and Hawkes Processes.
 
 
 Provides:
-- PoissonProcess with Simulate(T , Lambda) and GetEventTimes()
-- HawkesProcess with ogato thinning: Simulate(T) and GetEventTimes() , GetIntensityCurves() , ComputeIntensity(t)
+- PoissonProcess with Simulate(T , Lambda) , SimulatePiecewise / SimulateFunction and GetEventTimes()
+- HawkesProcess with ogato thinning or cluster sampling: Simulate(T , method=... , deadline , max_events) , SimulateChunks (generator) and GetEventTimes() , GetIntensityCurves() , ComputeIntensity(t)
+- SimulatePoissonPaths / SimulateHawkesPaths: K paths at once in CSR (events , offsets) form
 
 """
 
 
 #Impoting libraries
+import math
+import time
 import numpy as np
 import matplotlib.pyplot as plt
 import os
 
+try:
+    from backend.Kernels import get_decay_sums
+except ImportError:
+    from Kernels import get_decay_sums
+
+# hard cap on events per path so explosive parameter sets can't exhaust memory
+MAX_EVENTS = int(1e6)
+
+
 class PoissonProcess:
     def __init__(self):
-        self.lambda_ = None
+        self.lambda_ = None  # constant rate of the last Simulate()
+        self.breakpoints_ = None  # segment edges and rates of the last SimulatePiecewise()
+        self.rates_ = None
+        self.rate_fn = None  # rate function of the last SimulateFunction()
         self.events = np.array([])
 
-    def Simulate(self , T , Lambda , rng=None):
+    def Simulate(self , T , Lambda , rng=None , method="uniform"):
         """
         Simulate a homogenous poissons process on [0 , T].
+
+        Vectorized: "uniform" draws N ~ Poisson(Lambda * T) and sorts N uniforms
+        on [0 , T]; "gaps" takes a cumulative sum of exponential gaps drawn in
+        chunks until T is passed.
         
         :param self: Description
         :param T(float): end time
         :param Lambda(float): constant rate (lambda > 0)
         :param rng: Optional numpy RandomState or generator
+        :param method(str): "uniform" (default) or "gaps"
         
         Returns:
         np.ndarray : event times
@@ -40,16 +60,101 @@ class PoissonProcess:
         self.lambda_ = float(Lambda)
         rng = np.random if rng is None else rng
 
-        events = []
-        t =  0.0
+        if method == "uniform":
+            n = rng.poisson(self.lambda_ * T)
+            events = np.sort(rng.uniform(0.0 , T , size=n))
+        elif method == "gaps":
+            events = self._SimulateGaps(T , rng)
+        else:
+            raise ValueError(f"Unknown simulation method: {method!r}")
+
+        self.events = events
+        return self.events
+
+    def _SimulateGaps(self , T , rng):
+        """Cumulative sum of Exp(lambda) gaps, drawn in chunks sized from the expected count."""
+        expected = self.lambda_ * T
+        chunk = int(expected + 4.0 * np.sqrt(expected)) + 16
+        pieces = []
+        t = 0.0
         while True:
-            dt = rng.exponential(1.0 / self.lambda_)
-            t += dt
-            if t > T:
+            times = t + np.cumsum(rng.exponential(1.0 / self.lambda_ , size=chunk))
+            if times[-1] > T:
+                pieces.append(times[: np.searchsorted(times , T , side="right")])
                 break
-            events.append(t)
+            pieces.append(times)
+            t = times[-1]
+        return np.concatenate(pieces)
+
+    def SimulatePiecewise(self , T , breakpoints , rates , rng=None):
+        """
+        Simulate an inhomogeneous poisson process with piecewise-constant rate.
+
+        Each segment is homogeneous, so its count is Poisson(rate_k * length_k)
+        and its times are uniforms on the segment, all drawn in one batch.
+
+        :param T(float): end time
+        :param breakpoints: segment edges [0 = b_0 < b_1 < ... < b_K], clipped to T;
+            ValueError unless b_0 == 0 and the edges strictly increase
+        :param rates: rate on each segment [b_k , b_{k+1}), length K
+        :param rng: Optional numpy RandomState or generator
+
+        Returns:
+        np.ndarray : event times
+        """
+        breakpoints = np.asarray(breakpoints , dtype=float)
+        rates = np.asarray(rates , dtype=float)
+        if breakpoints.ndim != 1 or len(breakpoints) != len(rates) + 1:
+            raise ValueError("breakpoints must have one more entry than rates")
+        if breakpoints[0] != 0.0:
+            raise ValueError("breakpoints must start at 0")
+        if np.any(np.diff(breakpoints) <= 0):
+            raise ValueError("breakpoints must be strictly increasing")
+        if np.any(rates < 0):
+            raise ValueError("rates must be non-negative")
+
+        rng = np.random if rng is None else rng
+        self.breakpoints_ = breakpoints
+        self.rates_ = rates
+        edges = np.clip(breakpoints , 0.0 , T)
+        lengths = np.diff(edges)
+        counts = rng.poisson(rates * lengths)
+        segment = np.repeat(np.arange(len(rates)) , counts)
+        times = edges[segment] + rng.random(segment.size) * lengths[segment]
+
+        self.events = np.sort(times)
+        return self.events
+
+    def SimulateFunction(self , T , rate_fn , lambda_max , rng=None):
+        """
+        Simulate an inhomogeneous poisson process with rate function via thinning.
+
+        Candidates come from a homogeneous process at lambda_max and are kept
+        with probability rate_fn(t) / lambda_max; rate_fn is called once on the
+        whole candidate array.
+
+        :param T(float): end time
+        :param rate_fn: vectorized callable t -> lambda(t) >= 0
+        :param lambda_max(float): upper bound on rate_fn over [0 , T]
+        :param rng: Optional numpy RandomState or generator
+
+        Returns:
+        np.ndarray : event times
+        """
+        rng = np.random if rng is None else rng
+        self.rate_fn = rate_fn
+        if lambda_max <= 0 or T <= 0:
+            self.events = np.array([])
+            return self.events
+
+        n = rng.poisson(lambda_max * T)
+        candidates = np.sort(rng.uniform(0.0 , T , size=n))
+        rates = np.asarray(rate_fn(candidates) , dtype=float)
+        if np.any(rates > lambda_max):
+            raise ValueError("rate_fn exceeds lambda_max; thinning bound is invalid")
 
-        self.events = np.array(events)
+        keep = rng.random(n) * lambda_max <= rates
+        self.events = candidates[keep]
         return self.events
         
     def GetEventTimes(self):
@@ -87,89 +192,427 @@ class HawkesProcess:
         return self.mu + np.sum(contributions)
     
 
+    def _ExcitationAfterEvents(self, events):
+        """
+        Excitation just after each event, S(t_i+) = alpha * sum_{j <= i} exp(-beta (t_i - t_j)).
+
+        Equal to alpha * (1 + g_i) with g the kernel decay sums, see Kernels.py.
+
+        :param events: sorted event times
+        """
+        return self.alpha * (1.0 + get_decay_sums()(events, self.beta))
+
     def ComputeIntensity(self, times, events=None):
-        """Vectorized intensity for array `times` given `events`."""
+        """
+        Vectorized intensity for array `times` given `events`.
+
+        lambda(t) only counts events strictly before t. The excitation is carried
+        recursively across the events, and each query time picks up the state of
+        its last preceding event, so the cost is O(N + M) rather than O(N * M).
+        """
         if events is None:
             events = self.events
-        intens = np.zeros_like(times, dtype=float)
-        if len(events) == 0:
-            intens[:] = self.mu
+        times = np.asarray(times, dtype=float)
+        events = np.asarray(events, dtype=float)
+        intens = np.full(times.shape, self.mu, dtype=float)
+        if len(events) == 0 or times.size == 0:
             return intens
-        for event in events:
-            # add alpha * exp(-beta*(t - event)) for t > event
-            mask = times > event
-            if np.any(mask):
-                intens[mask] += self.alpha * np.exp(-self.beta * (times[mask] - event))
-        intens += self.mu
+        if np.any(np.diff(events) < 0):
+            events = np.sort(events)
+
+        flat = times.ravel()
+        # sorted queries let searchsorted walk the events like a merge
+        order = None
+        if np.any(np.diff(flat) < 0):
+            order = np.argsort(flat, kind="stable")
+            flat = flat[order]
+
+        post = self._ExcitationAfterEvents(events)
+        idx = np.searchsorted(events, flat, side="left") - 1
+        has_past = idx >= 0
+        vals = np.full(flat.shape, self.mu, dtype=float)
+        last = idx[has_past]
+        vals[has_past] += post[last] * np.exp(-self.beta * (flat[has_past] - events[last]))
+
+        if order is None:
+            intens.reshape(-1)[:] = vals
+        else:
+            intens.reshape(-1)[order] = vals
         return intens
 
                 
-    def Simulate(self, T, rng=None):
-        """Simulate Hawkes process over [0, T] using Ogata's thinning.
-
-        This implementation uses a simple upper bound lambda_bar = mu + alpha * N,
-        which is a valid global upper bound because e^{-beta * x} <= 1.
-        It's not the tightest bound but is correct and stable for testing.
+    def Simulate(self, T, rng=None, method="thinning", deadline=None, max_events=MAX_EVENTS):
+        """Simulate Hawkes process over [0, T].
 
         Args:
             T (float): end time
             rng: optional numpy RandomState or Generator
+            method (str): "thinning" (Ogata, event by event) or "cluster"
+                (immigrant-offspring branching representation, vectorized per
+                generation). Both sample the same process, so either can be
+                used to cross-check the other.
+            deadline (float, optional): wall-clock budget in seconds ("thinning" only)
+            max_events (int): event budget
+
+        With "thinning", if a budget runs out first, the events are an exact sample
+        on the shorter window [0, self.t_reached]; self.stop_reason says why the run
+        ended ("T", "deadline", "max_events" or "max_iterations"). "cluster" draws
+        whole generations, so a cut-off run would miss late children that fall
+        early in time; it raises ValueError instead of truncating.
 
         Returns:
-            tuple: (events, intensity_times, intensity_values)
+            np.ndarray: event times
+        """
+        if self.beta <= 0:
+            raise ValueError("beta must be > 0 for the exponential kernel")
+
+        rng = np.random if rng is None else rng
+        if method == "thinning":
+            chunks = [chunk for _, chunk in self.SimulateChunks(T, rng, deadline=deadline, max_events=max_events)]
+            events = np.concatenate(chunks) if chunks else np.empty(0)
+        elif method == "cluster":
+            if deadline is not None:
+                raise ValueError("deadline is only supported with method='thinning'")
+            events = self._SimulateCluster(T, rng, max_events=max_events)
+            self.stop_reason = "T"
+            self.t_reached = float(T)
+        else:
+            raise ValueError(f"Unknown simulation method: {method!r}")
+
+        self.events = events
+        return self.events
+
+    def SimulateChunks(self, T, rng=None, chunk_size=10000, deadline=None, max_events=MAX_EVENTS,
+                       progress_interval=0.25):
+        """Ogata thinning as a generator of (t, events) chunks.
+
+        A chunk is yielded once chunk_size events are buffered or progress_interval
+        seconds have passed (possibly empty, so `t` - the simulated time reached -
+        still reports progress). The clock is read once per block of 4096
+        candidates, so budgets add no per-event cost. Closing the generator stops
+        the simulation; when it finishes, self.stop_reason and self.t_reached are set.
         """
+        if self.beta <= 0:
+            raise ValueError("beta must be > 0 for the exponential kernel")
         rng = np.random if rng is None else rng
+        return self._SimulateThinning(T, rng, max_events, chunk_size, deadline, progress_interval)
+
+    def _SimulateThinning(self, T, rng, max_events=MAX_EVENTS, chunk_size=10000, deadline=None,
+                          progress_interval=0.25):
+        """Ogata's thinning with an O(1) recursive intensity update.
+
+        The exponential kernel lets us carry the excitation
+        S(t) = sum_{t_i < t} alpha * exp(-beta * (t - t_i)) forward recursively,
+        so lambda(t) = mu + S(t) costs O(1) per candidate instead of a sum over
+        all past events. Between jumps the intensity only decays, so the value
+        just after the last accepted/rejected point, lambda(t+), is a valid and
+        tight upper bound lambda_bar until the next candidate.
+
+        Uniforms are drawn from `rng` in blocks to keep per-candidate overhead low.
+        """
+        mu, alpha, beta = self.mu, self.alpha, self.beta
         events = []
+        n_events = 0
         t = 0.0
+        excitation = 0.0  # S(t+) at the current time t
         max_iterations = int(1e7)
-        max_events = int(1e6)
         it = 0
 
-        while t < T and it < max_iterations:
+        started = time.monotonic()
+        last_flush = started
+        stop_reason = "max_iterations"
+
+        block = 4096
+        uniforms = rng.random(2 * block)
+        pos = 0
+
+        while it < max_iterations:
             it += 1
-            lambda_bar = self.mu + self.alpha * len(events)
+            lambda_bar = mu + excitation
             if lambda_bar <= 0:
+                stop_reason = "T"
+                t = T
                 break
 
-            u = rng.random()
-            w = -np.log(u) / lambda_bar
+            if pos >= 2 * block:
+                now = time.monotonic()
+                if deadline is not None and now - started >= deadline:
+                    stop_reason = "deadline"
+                    break
+                if now - last_flush >= progress_interval:
+                    last_flush = now
+                    yield t, np.array(events, dtype=float)
+                    events = []
+                uniforms = rng.random(2 * block)
+                pos = 0
+            u = uniforms[pos]
+            D = uniforms[pos + 1]
+            pos += 2
+
+            # u in [0, 1) so log1p(-u) is finite
+            w = -math.log1p(-u) / lambda_bar
             t_candidate = t + w
             if t_candidate > T:
+                stop_reason = "T"
+                t = T
                 break
 
-            # acceptance test
-            lambda_t = self.ComputeIntensityScalar(t_candidate, events)
-            D = rng.random()
-            if D <= lambda_t / lambda_bar:
-                events.append(t_candidate)
-                t = t_candidate
-                if len(events) >= max_events:
+            # decay the excitation to the candidate time
+            excitation *= math.exp(-beta * w)
+            t = t_candidate
+
+            # acceptance test: lambda(t_candidate) / lambda_bar
+            if D * lambda_bar <= mu + excitation:
+                events.append(t)
+                excitation += alpha
+                n_events += 1
+                if n_events >= max_events:
+                    stop_reason = "max_events"
                     break
-            else:
-                t = t_candidate
-
-        self.events = np.array(events)
-        return self.events
+                if len(events) >= chunk_size:
+                    last_flush = time.monotonic()
+                    yield t, np.array(events, dtype=float)
+                    events = []
+
+        self.stop_reason = stop_reason
+        self.t_reached = float(t)
+        yield t, np.array(events, dtype=float)
+
+    def _SimulateCluster(self, T, rng, max_events=MAX_EVENTS):
+        """Simulate via the Poisson cluster (branching) representation.
+
+        Immigrants arrive as a homogeneous Poisson(mu) process on [0, T]. Every
+        event then has Poisson(alpha / beta) children, each delayed by an
+        Exp(beta) waiting time. One generation is drawn per NumPy batch and
+        children past T are dropped, so the Python loop runs once per
+        generation rather than once per candidate. Raises ValueError once the
+        total passes max_events: a sample cut off mid-generation is not an
+        exact prefix.
+        """
+        mu, alpha, beta = self.mu, self.alpha, self.beta
+        branching = alpha / beta
+
+        n_immigrants = rng.poisson(mu * T) if mu > 0 and T > 0 else 0
+        generation = rng.uniform(0.0, T, size=n_immigrants)
+        generations = [generation]
+        total = generation.size
+
+        while total <= max_events and generation.size and branching > 0:
+            counts = rng.poisson(branching, size=generation.size)
+            n_children = int(counts.sum())
+            if n_children == 0:
+                break
+            parents = np.repeat(generation, counts)
+            children = parents + rng.exponential(1.0 / beta, size=n_children)
+            generation = children[children <= T]
+            generations.append(generation)
+            total += generation.size
+
+        if total > max_events:
+            raise ValueError(
+                f"cluster simulation exceeded max_events={max_events}; "
+                "use method='thinning' for a truncated run or raise max_events"
+            )
+        return np.sort(np.concatenate(generations)).astype(float, copy=False)
     
 
     def GetEventTimes(self):
         return self.events
     
-    def GetIntensityCurve(self , T , n_points = 2000 , events=None):
-        """ return times and intensity value over [0 , T]"""
+    def GetIntensityCurve(self , T , n_points = 2000 , events=None , jumps=False):
+        """ return times and intensity value over [0 , T]
+
+        With jumps=True every event time is merged into the grid twice, carrying
+        lambda(t_i-) and then lambda(t_i+), so a line plot follows the exact
+        piecewise-exponential path instead of cutting across the jumps.
+        """
+        if events is None:
+            events = self.events
         times = np.linspace(0 , T , n_points)
         intens = self.ComputeIntensity(times , events)
-        return times , intens
+        if not jumps or len(events) == 0:
+            return times , intens
+
+        events = np.sort(np.asarray(events , dtype=float))
+        events = events[(events >= 0) & (events <= T)]
+        post = self.mu + self._ExcitationAfterEvents(events)
+        pre = self.ComputeIntensity(events , events)
+
+        all_times = np.concatenate([times , events , events])
+        all_intens = np.concatenate([intens , pre , post])
+        # at equal times: grid / pre-jump value first, post-jump value last
+        rank = np.concatenate([np.zeros(len(times) + len(events)) , np.ones(len(events))])
+        order = np.lexsort((rank , all_times))
+        return all_times[order] , all_intens[order]
     
 
+# --- Batched multi-path simulation ---
+#
+# Paths are returned in CSR (ragged) form: one flat float64 array of event
+# times plus an int64 offsets array of length K + 1, so path k is
+# events[offsets[k]:offsets[k + 1]].
+
+def _PathParams(n_paths, *params):
+    """Broadcast scalar / 1-D parameters to a common (K,) shape."""
+    arrays = [np.atleast_1d(np.asarray(p, dtype=float)) for p in params]
+    shapes = [a.shape for a in arrays]
+    if n_paths is not None:
+        shapes.append((int(n_paths),))
+    shape = np.broadcast_shapes(*shapes)
+    if len(shape) != 1:
+        raise ValueError("path parameters must be scalars or 1-D arrays")
+    return [np.broadcast_to(a, shape) for a in arrays]
+
+
+def _PathsToCSR(times, path, n_paths):
+    """Sort event times within each path and build the offsets array."""
+    order = np.lexsort((times, path))
+    counts = np.bincount(path, minlength=n_paths)
+    offsets = np.zeros(n_paths + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return np.ascontiguousarray(times[order], dtype=float), offsets
+
+
+def SplitPaths(events, offsets):
+    """Split CSR output into a list of per-path views (no copies)."""
+    return [events[offsets[k]:offsets[k + 1]] for k in range(len(offsets) - 1)]
+
+
+def SimulatePoissonPaths(T, Lambda, n_paths=None, rng=None):
+    """
+    Simulate K independent homogeneous Poisson paths in one vectorized pass.
+
+    Draws the per-path counts N_k ~ Poisson(Lambda_k * T_k), then N_k uniform
+    times on [0, T_k], sorted within each path.
+
+    :param T: end time, scalar or array of shape (K,)
+    :param Lambda: rate, scalar or array of shape (K,)
+    :param n_paths: number of paths K (inferred from array parameters if None)
+    :param rng: Optional numpy RandomState or generator
+
+    Returns:
+    tuple: (events, offsets) in CSR form
+    """
+    rng = np.random if rng is None else rng
+    T_k, lam_k = _PathParams(n_paths, T, Lambda)
+    K = T_k.shape[0]
+
+    rate = np.where((lam_k > 0) & (T_k > 0), lam_k * T_k, 0.0)
+    counts = rng.poisson(rate)
+    path = np.repeat(np.arange(K), counts)
+    times = rng.random(path.size) * T_k[path]
+    return _PathsToCSR(times, path, K)
+
+
+def SimulateHawkesPaths(mu, alpha, beta, T, n_paths=None, rng=None):
+    """
+    Simulate K independent Hawkes paths in one vectorized pass.
+
+    Uses the cluster representation (see HawkesProcess._SimulateCluster) with
+    every path advanced together: each generation across all K paths is one
+    NumPy batch, tagged with its path index. Requires alpha / beta < 1 for every
+    path, otherwise the total size is unbounded.
+
+    :param mu: baseline, scalar or array of shape (K,)
+    :param alpha: jump size, scalar or array of shape (K,)
+    :param beta: decay rate, scalar or array of shape (K,)
+    :param T: end time, scalar or array of shape (K,)
+    :param n_paths: number of paths K (inferred from array parameters if None)
+    :param rng: Optional numpy RandomState or generator
+
+    Returns:
+    tuple: (events, offsets) in CSR form
+    """
+    rng = np.random if rng is None else rng
+    mu_k, alpha_k, beta_k, T_k = _PathParams(n_paths, mu, alpha, beta, T)
+    K = T_k.shape[0]
+
+    if np.any(beta_k <= 0):
+        raise ValueError("beta must be > 0 for the exponential kernel")
+    branching = alpha_k / beta_k
+    if np.any(branching >= 1.0):
+        raise ValueError("batched simulation requires alpha / beta < 1 on every path")
+
+    rate = np.where((mu_k > 0) & (T_k > 0), mu_k * T_k, 0.0)
+    path = np.repeat(np.arange(K), rng.poisson(rate))
+    times = rng.random(path.size) * T_k[path]
+    all_times = [times]
+    all_paths = [path]
+
+    while times.size:
+        counts = rng.poisson(branching[path])
+        path = np.repeat(path, counts)
+        times = np.repeat(times, counts) + rng.exponential(size=path.size) / beta_k[path]
+        keep = times <= T_k[path]
+        times = times[keep]
+        path = path[keep]
+        all_times.append(times)
+        all_paths.append(path)
+
+    return _PathsToCSR(np.concatenate(all_times), np.concatenate(all_paths), K)
+
+
 # --- Visualization / small runner ---
 
-def PlotEventTimeline(times , events , title , fname = None):
+# Plots draw events as one LineCollection (vlines) instead of one artist per
+# event, and thin rugs / curves to at most max_points samples first, so
+# rendering cost is bounded by the figure resolution, not by the event count.
+
+MAX_PLOT_POINTS = 4000
+
+
+def DownsampleMinMax(x , y , max_points = MAX_PLOT_POINTS):
+    """ Shape-preserving downsampling of a sorted-x line for plotting
+
+    x is cut into (max_points - 2) // 2 equal-width buckets and each bucket keeps its
+    minimum and maximum sample (in x order), so spikes survive unchanged.
+    Inputs that already fit are returned as is.
+    """
+    x = np.asarray(x , dtype=float)
+    y = np.asarray(y , dtype=float)
+    if len(x) <= max_points:
+        return x , y
+
+    n_buckets = max(1 , (max_points - 2) // 2)
+    edges = np.linspace(x[0] , x[-1] , n_buckets + 1)
+    bucket = np.clip(np.searchsorted(edges , x , side="right") - 1 , 0 , n_buckets - 1)
+    starts = np.flatnonzero(np.concatenate([[True] , bucket[1:] != bucket[:-1]]))
+    seg = np.repeat(np.arange(len(starts)) , np.diff(np.append(starts , len(x))))
+
+    keep = []
+    for reduce in (np.minimum , np.maximum):
+        hit = np.flatnonzero(y == reduce.reduceat(y , starts)[seg])
+        _ , first = np.unique(seg[hit] , return_index=True)
+        keep.append(hit[first])
+    keep = np.unique(np.concatenate(keep + [[0 , len(x) - 1]]))
+    return x[keep] , y[keep]
+
+
+def RugPositions(events , max_points = MAX_PLOT_POINTS , lo = None , hi = None):
+    """ Event positions for a rug plot, at most max_points of them
+
+    Events sharing one of max_points equal-width buckets of [lo , hi] (about a
+    pixel column at usual figure sizes) are drawn once, at the first of them.
+    """
+    events = np.asarray(events , dtype=float)
+    if len(events) <= max_points:
+        return events
+    lo = events.min() if lo is None else lo
+    hi = events.max() if hi is None else hi
+    width = (hi - lo) / max_points or 1.0
+    bucket = np.floor((events - lo) / width).astype(np.int64)
+    _ , first = np.unique(bucket , return_index=True)
+    return events[first]
+
+
+def PlotEventTimeline(times , events , title , fname = None , max_points = MAX_PLOT_POINTS):
+    end = times[-1] if len(times) else 1
     plt.figure(figsize=(10 , 3))
-    plt.hlines(1 ,0 , times[-1] if len(times) else 1 , colors="#ddd")
-    for e in events:
-        plt.axvline(e , color="C1"  , alpha = 0.8)
-    plt.xlim(0 , times[-1] if len(times) else 1)
+    ax = plt.gca()
+    plt.hlines(1 ,0 , end , colors="#ddd")
+    ax.vlines(RugPositions(events , max_points , 0 , end) , 0 , 1 ,
+              transform=ax.get_xaxis_transform() , color="C1" , alpha = 0.8)
+    plt.xlim(0 , end)
     plt.yticks([])
     plt.xlabel("Time")
     plt.title(title)
@@ -197,11 +640,13 @@ def PlotInterarrivalHist(events , Lambda , title , fname=None):
         plt.savefig(fname)
     plt.close()
 
-def plot_intensity_with_events(times, intensity, events, title, fname=None):
+def plot_intensity_with_events(times, intensity, events, title, fname=None, max_points=MAX_PLOT_POINTS):
     plt.figure(figsize=(10, 4))
-    plt.plot(times, intensity, label='Intensity')
-    for e in events:
-        plt.axvline(e, color='k', alpha=0.2)
+    ax = plt.gca()
+    plt.plot(*DownsampleMinMax(times, intensity, max_points), label='Intensity')
+    lo, hi = (times[0], times[-1]) if len(times) else (None, None)
+    ax.vlines(RugPositions(events, max_points, lo, hi), 0, 1,
+              transform=ax.get_xaxis_transform(), color='k', alpha=0.2)
     plt.xlabel('Time')
     plt.ylabel('Intensity')
     plt.title(title)
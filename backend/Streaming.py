@@ -0,0 +1,210 @@
+"""
+Streaming / online Hawkes likelihood for live tick feeds.
+
+HawkesLikelihood and FitModel see the whole event array at once. Here events
+arrive in batches and the horizon T moves forward; each batch of k events costs
+O(k) because only the kernel state at the current horizon is carried:
+
+    A(T)  = sum_j exp(-beta (T - t_j))        (excitation / alpha at T)
+    A'(T) = dA/dbeta = -sum_j (T - t_j) exp(-beta (T - t_j))
+
+For a batch of events in (T0 , T1] the log-likelihood contribution is
+
+    sum_i log(mu + alpha g_i) - mu (T1 - T0) - (alpha/beta) (A(T0) + k - A(T1))
+
+which sums to HawkesLikelihood.log_likelihood when parameters are held fixed.
+
+Provides:
+- StreamingLikelihood: running log-likelihood (and its gradient per batch) at fixed parameters
+- OnlineHawkesEstimator: recursive MLE, one AdaGrad step in log-space per batch
+"""
+
+
+import numpy as np
+
+try:
+    from backend.Kernels import get_decay_derivs
+except ImportError:
+    from Kernels import get_decay_derivs
+
+
+class StreamingLikelihood:
+    """
+    Incremental log-likelihood of a univariate exponential Hawkes process.
+
+    Attributes:
+        mu , alpha , beta (float): Parameters the likelihood is evaluated at
+        T (float): Current horizon
+        n (int): Events seen so far
+        logsum (float): Running sum of log(lambda(t_i))
+        integral (float): Running compensator, integral_0^T lambda(t) dt
+    """
+
+    def __init__(self , mu , alpha , beta , T0 = 0.0 , backend = None):
+        """
+        :param mu: Baseline intensity (> 0)
+        :param alpha: Jump amplitude (>= 0)
+        :param beta: Decay rate (> 0)
+        :param T0: Start of the observation window
+        :param backend: Kernel backend, see Kernels.get_decay_derivs
+        """
+
+        if mu <= 0 or alpha < 0 or beta <= 0:
+            raise ValueError("need mu > 0, alpha >= 0, beta > 0")
+        self.mu = float(mu)
+        self.alpha = float(alpha)
+        self.beta = float(beta)
+        self.T = float(T0)
+        self.n = 0
+        self.logsum = 0.0
+        self.integral = 0.0
+        self._A = 0.0
+        self._dA = 0.0
+        self._decay_derivs = get_decay_derivs(backend)
+
+    def _advance(self , times , T):
+        """
+        Absorb a batch of events and move the horizon to T.
+
+        returns:
+            tuple: (batch log-likelihood , batch gradient w.r.t. (mu , alpha , beta))
+        """
+
+        times = np.sort(np.asarray(times , dtype=float).ravel())
+        k = len(times)
+        if T is None:
+            T = max(self.T , times[-1]) if k else self.T
+        T = float(T)
+        if T < self.T:
+            raise ValueError(f"horizon moved backwards: {T} < {self.T}")
+        if k and (times[0] < self.T or times[-1] > T):
+            raise ValueError(f"batch events must lie in [{self.T} , {T}]")
+
+        mu , alpha , beta = self.mu , self.alpha , self.beta
+        A0 , dA0 = self._A , self._dA
+        span = T - self.T
+        decay_span = np.exp(-beta * span)
+        A1 = A0 * decay_span
+        dA1 = decay_span * (dA0 - span * A0)
+
+        logsum = 0.0
+        grad = np.array([-span , 0.0 , 0.0])
+        if k:
+            g_in , h_in , _ = self._decay_derivs(times , beta)
+            D = times - self.T
+            d = np.exp(-beta * D)
+            g = A0 * d + g_in
+            h = d * (dA0 - D * A0) + h_in
+            inv = 1.0 / (mu + alpha * g)
+            logsum = -np.sum(np.log(inv))
+
+            s = T - times
+            E = np.exp(-beta * s)
+            A1 += np.sum(E)
+            dA1 -= np.sum(s * E)
+
+            grad[0] += np.sum(inv)
+            grad[1] += np.sum(g * inv)
+            grad[2] += alpha * np.sum(h * inv)
+
+        decayed = A0 + k - A1  # beta * integral of the excitation over (T0 , T] / alpha
+        integral = mu * span + (alpha / beta) * decayed
+        grad[1] -= decayed / beta
+        grad[2] -= alpha * (-decayed / beta**2 + (dA0 - dA1) / beta)
+
+        self.T = T
+        self.n += k
+        self.logsum += logsum
+        self.integral += integral
+        self._A , self._dA = A1 , dA1
+        return logsum - integral , grad
+
+    def update(self , times , T = None):
+        """
+        Append a batch of event times and extend the horizon.
+
+        :param times: New event times, all >= the current horizon
+        :param T: New horizon (defaults to the last new event time)
+
+        returns:
+            float: log-likelihood contribution of the batch
+        """
+        batch_ll , _ = self._advance(times , T)
+        return batch_ll
+
+    def log_likelihood(self):
+        """Log-likelihood of everything seen so far on [T0 , T]."""
+        return self.logsum - self.integral
+
+    def intensity(self):
+        """Current intensity lambda(T)."""
+        return self.mu + self.alpha * self._A
+
+    @property
+    def branching_ratio(self):
+        return self.alpha / self.beta
+
+
+class OnlineHawkesEstimator(StreamingLikelihood):
+    """
+    Recursive maximum-likelihood estimates updated as ticks arrive.
+
+    After each batch the parameters take one gradient-ascent step on the batch
+    log-likelihood, in log-space and scaled per coordinate by the running
+    root-sum-of-squares of past gradients (AdaGrad), so the step size does not
+    depend on batch length. The carried kernel state is not recomputed when beta
+    changes; with small steps this is the usual recursive-MLE approximation.
+
+    Attributes:
+        learning_rate (float): Step size in log-space
+        max_ratio (float): alpha/beta is projected back below this after each step
+        history (list): (T , mu , alpha , beta) after each update
+    """
+
+    def __init__(self , mu0 = 0.1 , alpha0 = 0.1 , beta0 = 1.0 , learning_rate = 0.2 ,
+                 max_ratio = 0.99 , T0 = 0.0 , backend = None):
+        """
+        :param mu0 , alpha0 , beta0: Initial parameter estimates
+        :param learning_rate: Step size in log-space
+        :param max_ratio: Cap on the branching ratio alpha/beta
+        :param T0: Start of the observation window
+        :param backend: Kernel backend, see Kernels.get_decay_derivs
+        """
+
+        super().__init__(mu0 , max(alpha0 , 1e-12) , beta0 , T0=T0 , backend=backend)
+        self.learning_rate = float(learning_rate)
+        self.max_ratio = float(max_ratio)
+        self._sq_grad = np.zeros(3)
+        self.history = []
+
+    def update(self , times , T = None):
+        """
+        Append a batch, then take one step on the parameters.
+
+        :param times: New event times, all >= the current horizon
+        :param T: New horizon (defaults to the last new event time)
+
+        returns:
+            dict: current estimates {"mu" , "alpha" , "beta" , "branching_ratio"}
+        """
+
+        _ , grad = self._advance(times , T)
+        theta = np.array([self.mu , self.alpha , self.beta])
+        grad_x = theta * grad
+        if np.all(np.isfinite(grad_x)):
+            self._sq_grad += grad_x ** 2
+            step = self.learning_rate * grad_x / (np.sqrt(self._sq_grad) + 1e-12)
+            mu , alpha , beta = theta * np.exp(step)
+            alpha = min(alpha , self.max_ratio * beta)
+            self.mu , self.alpha , self.beta = float(mu) , float(alpha) , float(beta)
+
+        self.history.append((self.T , self.mu , self.alpha , self.beta))
+        return self.params()
+
+    def params(self):
+        return {
+            "mu": self.mu,
+            "alpha": self.alpha,
+            "beta": self.beta,
+            "branching_ratio": self.branching_ratio,
+        }
@@ -1,3 +1,3 @@
 """Backend package for Hawkes process simulation and MLE."""
 
-__all__ = ["Simulation", "Likelihood", "FitModel"]
+__all__ = ["Simulation", "Kernels", "Likelihood", "FitModel", "Streaming", "ChunkedLikelihood", "ModelComparison", "RollingComparison", "BatchComparison", "Ingest", "EventStore", "FitCache", "Benchmarks", "Metrics"]
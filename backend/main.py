@@ -2,35 +2,192 @@
 FastAPI backend for LambdaLab.
 
 Provides endpoints for simulation, fitting, and model comparison.
+
+/api/simulate negotiates its encoding on the Accept header:
+    application/json (default)   summary, events list and (optionally) base64 plots
+    application/octet-stream     raw little-endian float64 / float32 arrays back to
+                                 back (events, then times and intensity if requested);
+                                 the summary is in the X-Simulation header (JSON) and
+                                 the array layout in X-Arrays, e.g. "events:812,times:2624,intensity:2624"
+Plots are fetched lazily as PNGs from /api/simulate/plot/{timeline|intensity}
+with the same parameters and the seed echoed by /api/simulate (for a run that
+stopped early, T = T_run so the re-run covers exactly the same window).
+
+Every simulation runs under a wall-clock deadline and an event budget; a run
+that hits either covers [0, T_run] with T_run < T and reports stop_reason.
+/api/simulate/stream sends events as they are generated, as NDJSON lines (or
+SSE events with Accept: text/event-stream):
+    {"type": "chunk", "t", "progress", "n_events", "events": [...]}   repeated
+    {"type": "done", "seed", "stop_reason", "t_reached", "n_events", "elapsed"}
+    {"type": "error", "detail"}
+and stops the worker when the client disconnects.
+
+Fits and model comparisons are jobs: POST /api/fit or /api/compare with a
+multipart event file (CSV / Parquet trades read through Ingest, or a .npy of
+event times) returns 202 and a job id at once; the request body is parsed as
+it arrives and the file part written straight to a temporary file (uploads
+over LAMBDALAB_MAX_UPLOAD_MB are refused with 413 without being stored), and
+the work runs in a separate process pool. Poll
+/api/jobs/{id} for status and /api/jobs/{id}/result for the result.
+
+Responses carry a Server-Timing header with per-stage durations (queue,
+simulate, intensity, plot_*, encode, total for /api/simulate), and /metrics
+exposes Prometheus request / stage latency histograms and counters, including
+objective-evaluation counts and time for fit jobs. LAMBDALAB_METRICS=0 turns
+both off.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import numpy as np
-from typing import Optional
+from typing import Literal, Optional
+import asyncio
+import functools
 import io
+import os
 import base64
-import matplotlib.pyplot as plt
+import json
+import multiprocessing
+import queue
+import secrets
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from matplotlib.figure import Figure
 
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
 # Import simulation and fitting modules
 import sys
-sys.path.insert(0, '/home/c0d3crusad3r/Project/LambdaLab')
-from Simulation import PoissonProcess, HawkesProcess
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from Simulation import PoissonProcess, HawkesProcess, DownsampleMinMax, RugPositions, MAX_PLOT_POINTS, MAX_EVENTS
+from Ingest import load_ticks
+from FitCache import FitCache
+from Metrics import ENABLED as METRICS_ENABLED, REGISTRY, Counter, Histogram, StageTimer
+
+# CPU-bound work (simulation + rendering) runs in a bounded process pool so the
+# event loop, /health and other requests stay responsive. At most
+# SIM_WORKERS + SIM_QUEUE simulations are admitted; beyond that we answer 429.
+SIM_WORKERS = int(os.environ.get("LAMBDALAB_SIM_WORKERS", os.cpu_count() or 1))
+SIM_QUEUE = int(os.environ.get("LAMBDALAB_SIM_QUEUE", 2 * SIM_WORKERS))
+# Upper bound (and default) for the per-request wall-clock budget, in seconds
+SIM_DEADLINE = float(os.environ.get("LAMBDALAB_SIM_DEADLINE", 20.0))
+# Open /api/simulate/stream responses (each holds a Manager queue and a slow client)
+MAX_STREAMS = int(os.environ.get("LAMBDALAB_MAX_STREAMS", SIM_WORKERS + SIM_QUEUE))
+
+# Fit / compare jobs get their own pool so long MLE runs never starve simulations.
+JOB_WORKERS = int(os.environ.get("LAMBDALAB_JOB_WORKERS", max(1, (os.cpu_count() or 1) // 2)))
+JOB_QUEUE = int(os.environ.get("LAMBDALAB_JOB_QUEUE", 16))
+JOB_HISTORY = int(os.environ.get("LAMBDALAB_JOB_HISTORY", 256))  # finished jobs kept for polling
+MAX_UPLOAD_BYTES = int(os.environ.get("LAMBDALAB_MAX_UPLOAD_MB", 512)) * 2**20
+
+_pool: Optional[ProcessPoolExecutor] = None
+_job_pool: Optional[ProcessPoolExecutor] = None
+_manager = None
+_in_flight = 0
+_open_streams = 0
+_jobs: "OrderedDict[str, dict]" = OrderedDict()
+_job_cache: Optional[FitCache] = None
+
 
-app = FastAPI(title="LambdaLab API")
+def get_pool() -> ProcessPoolExecutor:
+    """Worker pool, created on first use (and again if a worker died)."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=SIM_WORKERS)
+    return _pool
 
-# Enable CORS
+
+def get_job_pool() -> ProcessPoolExecutor:
+    """Fit / compare job pool, created on first use."""
+    global _job_pool
+    if _job_pool is None:
+        _job_pool = ProcessPoolExecutor(max_workers=JOB_WORKERS)
+    return _job_pool
+
+
+def get_manager():
+    """Manager for the queues / events shared with streaming workers, created on first use."""
+    global _manager
+    if _manager is None:
+        _manager = multiprocessing.Manager()
+    return _manager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    if _job_pool is not None:
+        _job_pool.shutdown(wait=False, cancel_futures=True)
+    if _manager is not None:
+        _manager.shutdown()
+
+
+app = FastAPI(title="LambdaLab API", lifespan=lifespan)
+
+# Enable CORS; LAMBDALAB_CORS_ORIGINS is a comma-separated origin list ("*" by default)
+CORS_ORIGINS = [o.strip() for o in os.environ.get("LAMBDALAB_CORS_ORIGINS", "*").split(",") if o.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Simulation", "X-Arrays", "Server-Timing"],
 )
 
 
+# --- Instrumentation ---
+
+REQUEST_SECONDS = Histogram("lambdalab_request_seconds", "HTTP request latency until response headers")
+REQUESTS = Counter("lambdalab_requests_total", "HTTP requests by route, method and status")
+STAGE_SECONDS = Histogram("lambdalab_stage_seconds", "Time per request stage")
+REJECTED = Counter("lambdalab_rejected_total", "Requests refused with 429 because a pool was full")
+JOB_SECONDS = Histogram("lambdalab_job_seconds", "Fit / compare job latency from submission to completion")
+FIT_EVALUATIONS = Counter("lambdalab_fit_objective_evaluations_total", "Likelihood objective evaluations in fit jobs")
+FIT_OBJECTIVE_SECONDS = Counter("lambdalab_fit_objective_seconds_total", "Time spent in likelihood objective evaluations")
+
+
+def request_timer(request: Request) -> StageTimer:
+    """The request's stage timer (a throwaway one when instrumentation is off)."""
+    timer = getattr(request.state, "timer", None)
+    return timer if timer is not None else StageTimer()
+
+
+if METRICS_ENABLED:
+    @app.middleware("http")
+    async def timing_middleware(request: Request, call_next):
+        started = time.perf_counter()
+        timer = request.state.timer = StageTimer()
+        response = await call_next(request)
+        elapsed = time.perf_counter() - started
+
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        REQUEST_SECONDS.observe(elapsed, route=path, method=request.method)
+        REQUESTS.inc(route=path, method=request.method, status=response.status_code)
+        for name, seconds in timer.stages:
+            STAGE_SECONDS.observe(seconds, route=path, stage=name)
+        timer.add("total", elapsed)
+        response.headers["Server-Timing"] = timer.server_timing()
+        return response
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 # --- Request/Response Models ---
 
 class SimulateRequest(BaseModel):
@@ -38,40 +195,67 @@ class SimulateRequest(BaseModel):
     alpha: float
     beta: float
     T: float
+    seed: Optional[int] = Field(None, ge=0, lt=2**128)  # random if omitted; echoed back for reproducibility
+    max_points: int = Field(MAX_PLOT_POINTS, ge=100, le=100_000)  # rendered points per plot
+    plots: bool = True  # inline base64 plots in JSON responses (never in binary ones)
+    intensity: bool = False  # also return the intensity curve arrays
+    dtype: Literal["float64", "float32"] = "float64"  # binary array encoding
+    deadline: float = Field(SIM_DEADLINE, gt=0, le=SIM_DEADLINE)  # wall-clock budget, seconds
+    max_events: int = Field(MAX_EVENTS, ge=1, le=MAX_EVENTS)
+
+
+class StreamRequest(BaseModel):
+    mu: float
+    alpha: float
+    beta: float
+    T: float
+    seed: Optional[int] = Field(None, ge=0, lt=2**128)
+    deadline: float = Field(SIM_DEADLINE, gt=0, le=SIM_DEADLINE)
+    max_events: int = Field(MAX_EVENTS, ge=1, le=MAX_EVENTS)
+    chunk_size: int = Field(10_000, ge=100, le=1_000_000)  # events per streamed chunk (at most)
 
 
 class SimulateResponse(BaseModel):
+    seed: int
+    T_run: float
+    stop_reason: str
     n_events: int
     events: list
     mean_iat: Optional[float] = None
     std_iat: Optional[float] = None
     peak_intensity: Optional[float] = None
+    times: Optional[list] = None
+    intensity: Optional[list] = None
     plot_timeline: Optional[str] = None  # base64 encoded PNG
     plot_intensity: Optional[str] = None  # base64 encoded PNG
 
 
 # --- Utility Functions ---
 
-def fig_to_base64(fig: Figure) -> str:
-    """Convert matplotlib figure to base64 PNG string."""
+def fig_to_png(fig: Figure) -> bytes:
+    """Render matplotlib figure to PNG bytes."""
     buf = io.BytesIO()
     fig.savefig(buf, format='png', bbox_inches='tight', facecolor='#0a0a0a', edgecolor='none')
-    buf.seek(0)
-    img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-    plt.close(fig)
+    return buf.getvalue()
+
+
+def fig_to_base64(fig: Figure) -> str:
+    """Convert matplotlib figure to base64 PNG string."""
+    img_base64 = base64.b64encode(fig_to_png(fig)).decode('utf-8')
     return f"data:image/png;base64,{img_base64}"
 
 
-def plot_timeline(events: np.ndarray, T: float) -> str:
-    """Create event timeline plot."""
+def plot_timeline(events: np.ndarray, T: float, max_points: int = MAX_PLOT_POINTS, as_base64: bool = True):
+    """Create event timeline plot (base64 data URL, or PNG bytes if as_base64=False)."""
     try:
-        fig, ax = plt.subplots(figsize=(10, 2))
+        fig = Figure(figsize=(10, 2))
+        ax = fig.subplots()
         ax.set_facecolor('#0a0a0a')
         fig.set_facecolor('#0a0a0a')
         
         ax.hlines(1, 0, T, colors='#6b7280', linewidth=1)
-        for e in events:
-            ax.axvline(float(e), color='#3b82f6', alpha=0.8, linewidth=1.5)
+        ax.vlines(RugPositions(events, max_points, 0, T), 0, 1, transform=ax.get_xaxis_transform(),
+                  color='#3b82f6', alpha=0.8, linewidth=1.5)
         
         ax.set_xlim(0, T)
         ax.set_ylim(0.5, 1.5)
@@ -82,23 +266,24 @@ def plot_timeline(events: np.ndarray, T: float) -> str:
         ax.spines['top'].set_visible(False)
         ax.tick_params(colors='#ededed')
         
-        return fig_to_base64(fig)
+        return fig_to_base64(fig) if as_base64 else fig_to_png(fig)
     except Exception as e:
         print(f"Error in plot_timeline: {e}")
-        plt.close('all')
-        return ""
+        return "" if as_base64 else b""
 
 
-def plot_intensity(times: np.ndarray, intensity: np.ndarray, events: np.ndarray, T: float) -> str:
-    """Create intensity curve plot."""
+def plot_intensity(times: np.ndarray, intensity: np.ndarray, events: np.ndarray, T: float,
+                   max_points: int = MAX_PLOT_POINTS, as_base64: bool = True):
+    """Create intensity curve plot (base64 data URL, or PNG bytes if as_base64=False)."""
     try:
-        fig, ax = plt.subplots(figsize=(10, 4))
+        fig = Figure(figsize=(10, 4))
+        ax = fig.subplots()
         ax.set_facecolor('#0a0a0a')
         fig.set_facecolor('#0a0a0a')
         
-        ax.plot(times, intensity, color='#3b82f6', linewidth=1.5, label='Intensity')
-        for e in events:
-            ax.axvline(float(e), color='#6b7280', alpha=0.3, linewidth=0.8)
+        ax.plot(*DownsampleMinMax(times, intensity, max_points), color='#3b82f6', linewidth=1.5, label='Intensity')
+        ax.vlines(RugPositions(events, max_points, 0, T), 0, 1, transform=ax.get_xaxis_transform(),
+                  color='#6b7280', alpha=0.3, linewidth=0.8)
         
         ax.set_xlim(0, T)
         ax.set_xlabel('Time', color='#ededed', fontsize=10)
@@ -110,62 +295,582 @@ def plot_intensity(times: np.ndarray, intensity: np.ndarray, events: np.ndarray,
         ax.spines['right'].set_visible(False)
         ax.spines['top'].set_visible(False)
         
-        return fig_to_base64(fig)
+        return fig_to_base64(fig) if as_base64 else fig_to_png(fig)
     except Exception as e:
         print(f"Error in plot_intensity: {e}")
-        plt.close('all')
-        return ""
+        return "" if as_base64 else b""
+
+
+def simulation_horizon(mu: float, alpha: float, beta: float, T: float) -> float:
+    """Validated simulation horizon shared by every simulate endpoint: supercritical
+    runs (alpha / beta >= 1) are capped at T = 10. Raises ValueError for bad parameters."""
+    if beta <= 0:
+        raise ValueError("beta must be > 0 for the exponential kernel")
+    if mu < 0 or alpha < 0 or T < 0:
+        raise ValueError("mu, alpha and T must be >= 0")
+    # Handle supercritical regime
+    if alpha / beta >= 1.0:
+        return min(10.0, T)
+    return T
+
+
+def checked_horizon(mu: float, alpha: float, beta: float, T: float) -> float:
+    """simulation_horizon for request handlers: bad parameters are a 422."""
+    try:
+        return simulation_horizon(mu, alpha, beta, T)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def simulate_events(mu: float, alpha: float, beta: float, T: float, seed: int,
+                    deadline: float = SIM_DEADLINE, max_events: int = MAX_EVENTS):
+    """Seeded, budgeted simulation shared by /api/simulate and the plot endpoints."""
+    T_run = simulation_horizon(mu, alpha, beta, T)
+
+    # Simulate with a per-request generator: reproducible and independent of other requests
+    h = HawkesProcess(mu, alpha, beta)
+    events = h.Simulate(T_run, rng=np.random.default_rng(seed), deadline=deadline, max_events=max_events)
+    if h.stop_reason != "T":
+        T_run = h.t_reached
+    return h, T_run, events
+
+
+def run_simulation(mu: float, alpha: float, beta: float, T: float, seed: int,
+                   max_points: int = MAX_PLOT_POINTS, plots: bool = True,
+                   deadline: float = SIM_DEADLINE, max_events: int = MAX_EVENTS) -> dict:
+    """Simulate, summarize and optionally plot; runs in a worker process. Arrays stay numpy.
+    Stage durations are returned under "timings"."""
+    timer = StageTimer()
+    with timer.stage("simulate"):
+        h, T_run, events = simulate_events(mu, alpha, beta, T, seed, deadline, max_events)
+
+    n_events = len(events)
+    mean_iat = None
+    std_iat = None
+    if n_events >= 2:
+        iats = np.diff(events)
+        mean_iat = float(np.mean(iats))
+        std_iat = float(np.std(iats))
+
+    # Compute intensity (exact jumps, so the peak and the downsampled plot keep every spike)
+    with timer.stage("intensity"):
+        times, intens = h.GetIntensityCurve(T_run, n_points=1000, events=events, jumps=True)
+        peak_intensity = float(np.max(intens)) if len(intens) > 0 else None
+
+    plots_b64 = {"plot_timeline": None, "plot_intensity": None}
+    if plots:
+        with timer.stage("plot_timeline"):
+            plots_b64["plot_timeline"] = plot_timeline(events, T_run, max_points)
+        with timer.stage("plot_intensity"):
+            plots_b64["plot_intensity"] = plot_intensity(times, intens, events, T_run, max_points)
+
+    return {
+        "seed": seed,
+        "T_run": T_run,
+        "stop_reason": h.stop_reason,
+        "n_events": n_events,
+        "mean_iat": mean_iat,
+        "std_iat": std_iat,
+        "peak_intensity": peak_intensity,
+        "events": events,
+        "times": times,
+        "intensity": intens,
+        **plots_b64,
+        "timings": timer.stages,
+    }
+
+
+def render_plot(kind: str, mu: float, alpha: float, beta: float, T: float, seed: int,
+                max_points: int = MAX_PLOT_POINTS, max_events: int = MAX_EVENTS) -> tuple:
+    """Re-run a seeded simulation and render one plot as PNG; runs in a worker process.
+    Returns (png, stop_reason): a run cut by the wall-clock deadline is not reproducible."""
+    h, T_run, events = simulate_events(mu, alpha, beta, T, seed, SIM_DEADLINE, max_events)
+    if kind == "timeline":
+        return plot_timeline(events, T_run, max_points, as_base64=False), h.stop_reason
+    times, intens = h.GetIntensityCurve(T_run, n_points=1000, events=events, jumps=True)
+    return plot_intensity(times, intens, events, T_run, max_points, as_base64=False), h.stop_reason
+
+
+def stream_simulation(mu: float, alpha: float, beta: float, T: float, seed: int, deadline: float,
+                      max_events: int, chunk_size: int, out, cancel) -> None:
+    """Push ("chunk", t, events) messages to `out`, then ("done", ...) or ("error", ...);
+    stops after the next chunk once `cancel` is set. Runs in a worker process."""
+    h = HawkesProcess(mu, alpha, beta)
+    try:
+        T_run = simulation_horizon(mu, alpha, beta, T)
+        chunks = h.SimulateChunks(T_run, np.random.default_rng(seed), chunk_size=chunk_size,
+                                  deadline=deadline, max_events=max_events)
+        for t, chunk in chunks:
+            out.put(("chunk", t, chunk))
+            if cancel.is_set():
+                chunks.close()
+                return
+        out.put(("done", h.stop_reason, h.t_reached))
+    except Exception as e:
+        out.put(("error", str(e)))
+
+
+def check_capacity(stream: bool = False):
+    if _in_flight >= SIM_WORKERS + SIM_QUEUE or (stream and _open_streams >= MAX_STREAMS):
+        REJECTED.inc(pool="simulate")
+        raise HTTPException(status_code=429, detail="Server busy, retry shortly",
+                            headers={"Retry-After": "1"})
+
+
+async def run_in_pool(fn, *args):
+    """Run fn(*args) in the worker pool, with admission control (429) and crash recovery."""
+    global _pool, _in_flight
+    check_capacity()
+
+    _in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_pool(), fn, *args)
+    except BrokenProcessPool:
+        # a worker was killed (e.g. out of memory); start a fresh pool for later requests
+        _pool = None
+        raise HTTPException(status_code=503, detail="Simulation worker crashed")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _in_flight -= 1
+
+
+SUMMARY_FIELDS = ("seed", "T_run", "stop_reason", "n_events", "mean_iat", "std_iat", "peak_intensity")
 
 
 # --- API Endpoints ---
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "ok"}
 
 
 @app.post("/api/simulate")
-def simulate(req: SimulateRequest):
-    """Simulate a Hawkes process and return events and plots."""
+async def simulate(req: SimulateRequest, request: Request):
+    """Simulate a Hawkes process and return events (JSON or binary) and optionally plots."""
+    checked_horizon(req.mu, req.alpha, req.beta, req.T)
+    seed = req.seed if req.seed is not None else secrets.randbits(32)
+    binary = "application/octet-stream" in request.headers.get("accept", "")
+    timer = request_timer(request)
+    started = time.perf_counter()
+    result = await run_in_pool(
+        run_simulation, req.mu, req.alpha, req.beta, req.T, seed, req.max_points, req.plots and not binary,
+        req.deadline, req.max_events,
+    )
+    worker = result.pop("timings")
+    # pool wait + transfer = wall time in the pool minus the worker's own stages
+    timer.add("queue", max(0.0, time.perf_counter() - started - sum(seconds for _, seconds in worker)))
+    timer.extend(worker)
+
+    names = ["events", "times", "intensity"] if req.intensity else ["events"]
+    summary = {key: result[key] for key in SUMMARY_FIELDS}
+    with timer.stage("encode"):
+        if binary:
+            dtype = np.dtype(req.dtype).newbyteorder("<")
+            arrays = [np.ascontiguousarray(result[name], dtype=dtype) for name in names]
+            return Response(
+                content=b"".join(a.tobytes() for a in arrays),
+                media_type="application/octet-stream",
+                headers={
+                    "X-Simulation": json.dumps(summary),
+                    "X-Arrays": ",".join(f"{name}:{len(a)}" for name, a in zip(names, arrays)),
+                },
+            )
+
+        # JSONResponse directly: skips the per-element jsonable_encoder pass over large lists
+        content = dict(summary, plot_timeline=result["plot_timeline"], plot_intensity=result["plot_intensity"])
+        for name in names:
+            content[name] = result[name].tolist()
+        return JSONResponse(content)
+
+
+@app.get("/api/simulate/plot/{kind}")
+async def simulate_plot(request: Request, kind: Literal["timeline", "intensity"], mu: float, alpha: float,
+                        beta: float, T: float, seed: int = Query(..., ge=0, lt=2**128), max_points: int = MAX_PLOT_POINTS,
+                        max_events: int = MAX_EVENTS):
+    """PNG plot of the simulation identified by its parameters and seed.
+
+    Deterministic and cacheable unless the re-run itself stops on the deadline
+    (then sent with Cache-Control: no-store)."""
+    max_points = min(max(max_points, 100), 100_000)
+    max_events = min(max(max_events, 1), MAX_EVENTS)
+    checked_horizon(mu, alpha, beta, T)
+    with request_timer(request).stage("render"):
+        png, stop_reason = await run_in_pool(render_plot, kind, mu, alpha, beta, T, seed, max_points, max_events)
+    if not png:
+        raise HTTPException(status_code=500, detail="Plot rendering failed")
+    cache = "no-store" if stop_reason == "deadline" else "public, max-age=86400"
+    return Response(content=png, media_type="image/png", headers={"Cache-Control": cache})
+
+
+@app.post("/api/simulate/stream")
+async def simulate_stream(req: StreamRequest, request: Request):
+    """Stream simulated events in chunks with progress (NDJSON, or SSE with Accept: text/event-stream)."""
+    T_run = checked_horizon(req.mu, req.alpha, req.beta, req.T)
+    check_capacity(stream=True)
+    seed = req.seed if req.seed is not None else secrets.randbits(32)
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    manager = get_manager()
+    out, cancel = manager.Queue(), manager.Event()
+    job = asyncio.ensure_future(run_in_pool(
+        stream_simulation, req.mu, req.alpha, req.beta, req.T, seed,
+        req.deadline, req.max_events, req.chunk_size, out, cancel,
+    ))
+    job.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    def encode(message: dict) -> str:
+        data = json.dumps(message)
+        return f"event: {message['type']}\ndata: {data}\n\n" if sse else data + "\n"
+
+    async def messages():
+        global _open_streams
+        _open_streams += 1
+        started = time.perf_counter()
+        n_events = 0
+        try:
+            while not await request.is_disconnected():
+                # poll without blocking a threadpool thread per open stream
+                try:
+                    msg = out.get_nowait()
+                except queue.Empty:
+                    if not job.done():
+                        await asyncio.sleep(0.05)
+                        continue
+                    # the worker's puts all complete before it returns: one more look
+                    try:
+                        msg = out.get_nowait()
+                    except queue.Empty:
+                        msg = None
+                if msg is None:
+                    exc = None if job.cancelled() else job.exception()
+                    detail = exc.detail if isinstance(exc, HTTPException) else "Simulation worker exited"
+                    yield encode({"type": "error", "detail": detail})
+                    break
+
+                if msg[0] == "chunk":
+                    _, t, chunk = msg
+                    n_events += len(chunk)
+                    yield encode({"type": "chunk", "t": t, "progress": min(t / T_run, 1.0) if T_run > 0 else 1.0,
+                                  "n_events": n_events, "events": chunk.tolist()})
+                elif msg[0] == "done":
+                    yield encode({"type": "done", "seed": seed, "stop_reason": msg[1], "t_reached": msg[2],
+                                  "n_events": n_events, "elapsed": time.perf_counter() - started})
+                    break
+                else:
+                    yield encode({"type": "error", "detail": msg[1]})
+                    break
+        finally:
+            # client gone or stream finished: the worker stops after its current chunk
+            cancel.set()
+            _open_streams -= 1
+
+    return StreamingResponse(
+        messages(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# --- Fit / compare jobs ---
+
+def job_cache() -> FitCache:
+    """Per-worker fit cache; set LAMBDALAB_CACHE_DIR to share results between workers and restarts."""
+    global _job_cache
+    if _job_cache is None:
+        _job_cache = FitCache(disk_dir=os.environ.get("LAMBDALAB_CACHE_DIR"))
+    return _job_cache
+
+
+def load_events(path: str, filename: str, ingest: dict, T: Optional[float]):
+    """Event times and horizon from an uploaded file: .npy event times, or trades via Ingest.load_ticks."""
+    if filename.lower().endswith(".npy"):
+        events = np.load(path).astype(float)
+        if np.any(events[1:] < events[:-1]):
+            events = np.sort(events)
+        T_data = float(events[-1]) if len(events) else 0.0
+    else:
+        data = load_ticks(path, **ingest)
+        events, T_data = data["events"], data["T"]
+    if T is not None and T < T_data:
+        raise ValueError(f"T = {T} is before the last event ({T_data})")
+    T = T_data if T is None else T
+    if len(events) < 2 or T <= 0:
+        raise ValueError("need at least two events and a positive horizon")
+    return events, T
+
+
+def finite_or_none(value):
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def run_fit_job(path: str, filename: str, ingest: dict, T: Optional[float], method: str,
+                options: Optional[dict]) -> dict:
+    """Fit a Hawkes model to an uploaded file; runs in a job worker."""
+    events, T = load_events(path, filename, ingest, T)
+    res, cached = job_cache().fit(events, T, method=method, options=options, return_hit=True)
+    params = res.result_params
+    return {
+        "n": len(events),
+        "T": T,
+        "mu": params["mu"],
+        "alpha": params["alpha"],
+        "beta": params["beta"],
+        "branching_ratio": params["alpha"] / params["beta"],
+        "loglik": finite_or_none(-res.fun),
+        "success": bool(res.success),
+        "message": str(res.message),
+        "nfev": int(getattr(res, "nfev", 0)),
+        "cached": cached,
+        "timing": getattr(res, "timing", None),
+    }
+
+
+def run_compare_job(path: str, filename: str, ingest: dict, T: Optional[float], method: str,
+                    options: Optional[dict]) -> dict:
+    """Poisson vs Hawkes comparison of an uploaded file; runs in a job worker."""
+    events, T = load_events(path, filename, ingest, T)
+    result, cached = job_cache().compare(events, T, method=method, options=options, return_hit=True)
+    poisson, hawkes = result["poisson"], result["hawkes"]
+    return {
+        "n": len(events),
+        "T": T,
+        "poisson": {key: finite_or_none(poisson[key]) for key in ("lambda", "loglik", "aic")},
+        "hawkes": {key: finite_or_none(hawkes[key]) for key in ("mu", "alpha", "beta", "loglik", "aic")},
+        "delta_aic": finite_or_none(result["delta_aic"]),
+        "evidence_ratio": finite_or_none(result["evidence_ratio"]),
+        "interpretation": result["interpretation"],
+        "winner": result["winner"],
+        "cached": cached,
+        "timing": getattr(hawkes["fit_result"], "timing", None),
+    }
+
+
+def job_status(job_id: str, job: dict) -> dict:
+    future = job["future"]
+    if future.done():
+        status = "failed" if future.exception() is not None else "done"
+    else:
+        status = "running" if future.running() else "queued"
+    out = {"job_id": job_id, "kind": job["kind"], "filename": job["filename"], "status": status,
+           "created": job["created"], "finished": job["finished"]}
+    if job["finished"] is not None:
+        out["elapsed"] = job["finished"] - job["created"]
+    if status == "failed":
+        out["error"] = f"{type(future.exception()).__name__}: {future.exception()}"
+    return out
+
+
+def finish_job(job: dict, path: str, future) -> None:
+    """Done callback (pool thread): stamp the job, record its metrics and drop its upload.
+    Objective counters come from the fit's own timing, so cached results are not counted again."""
+    job["finished"] = time.time()
+    failed = future.cancelled() or future.exception() is not None
+    JOB_SECONDS.observe(job["finished"] - job["created"], kind=job["kind"], status="failed" if failed else "done")
+    result = None if failed else future.result()
+    timing = result.get("timing") if result and not result.get("cached") else None
+    if timing:
+        FIT_EVALUATIONS.inc(timing["evaluations"], kind=job["kind"])
+        FIT_OBJECTIVE_SECONDS.inc(timing["objective_seconds"], kind=job["kind"])
     try:
-        # Handle supercritical regime
-        T_run = req.T
-        if req.beta > 0 and req.alpha / req.beta >= 1.0:
-            T_run = min(10.0, req.T)
-        
-        # Simulate
-        h = HawkesProcess(req.mu, req.alpha, req.beta)
-        events = h.Simulate(T_run, rng=np.random)
-        
-        n_events = len(events)
-        mean_iat = None
-        std_iat = None
-        events_list = [float(e) for e in events]  # Convert numpy to list
-        
-        if n_events >= 2:
-            iats = np.diff(events)
-            mean_iat = float(np.mean(iats))
-            std_iat = float(np.std(iats))
-        
-        # Compute intensity
-        times, intens = h.GetIntensityCurve(T_run, n_points=1000, events=events)
-        peak_intensity = float(np.max(intens)) if len(intens) > 0 else None
-        
-        # Generate plots
-        plot_timeline_b64 = plot_timeline(events, T_run)
-        plot_intensity_b64 = plot_intensity(times, intens, events, T_run)
-        
-        return {
-            "n_events": n_events,
-            "events": events_list,
-            "mean_iat": mean_iat,
-            "std_iat": std_iat,
-            "peak_intensity": peak_intensity,
-            "plot_timeline": plot_timeline_b64,
-            "plot_intensity": plot_intensity_b64,
-        }
+        os.remove(path)
+    except OSError:
+        pass
+
+
+JOB_FIELDS = {"method": "L-BFGS-B", "options": None, "T": None, "time_column": "timestamp",
+              "unit": None, "ties": "keep", "session": None}
+
+
+class UploadReceiver:
+    """
+    python-multipart callbacks writing the file part of a form straight to a
+    named temporary file (kept with its extension for format detection) and
+    collecting the other parts as small text fields.
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self.filename = None
+        self.path = None
+        self._fh = None
+        self._headers = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._name = None
+        self._value = None
+
+    def on_part_begin(self):
+        self._headers = {}
+
+    def on_header_field(self, data, start, end):
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data, start, end):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = options.get(b"name", b"").decode("latin-1")
+        if b"filename" in options and self._name == "file" and self._fh is None:
+            self.filename = options[b"filename"].decode("latin-1")
+            suffix = os.path.splitext(self.filename)[1].lower() or ".csv"
+            fd, self.path = tempfile.mkstemp(prefix="lambdalab-", suffix=suffix)
+            self._fh = os.fdopen(fd, "wb")
+            self._value = None
+        else:
+            self._value = bytearray()
+
+    def on_part_data(self, data, start, end):
+        if self._value is None:
+            self._fh.write(data[start:end])
+        elif len(self._value) + end - start > 2**16:
+            raise HTTPException(status_code=413, detail=f"Form field {self._name!r} too large")
+        else:
+            self._value += data[start:end]
+
+    def on_part_end(self):
+        if self._value is None:
+            self._fh.close()
+        else:
+            self.fields[self._name] = self._value.decode("utf-8")
+
+    def discard(self):
+        if self._fh is not None:
+            self._fh.close()
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+async def receive_upload(request: Request) -> UploadReceiver:
+    """
+    Stream a multipart request body into a temporary file as it arrives.
+
+    Oversize uploads are refused from Content-Length before anything is read,
+    and otherwise as soon as the streamed body passes MAX_UPLOAD_BYTES; the
+    file is written once, with no spooling or second copy.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise HTTPException(status_code=415, detail="Expected a multipart/form-data upload")
+    length = request.headers.get("content-length")
+    if length is not None and length.isdigit() and int(length) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Upload too large")
+
+    receiver = UploadReceiver()
+    parser = MultipartParser(options[b"boundary"], callbacks={
+        name: getattr(receiver, name) for name in (
+            "on_part_begin", "on_part_data", "on_part_end", "on_header_field",
+            "on_header_value", "on_header_end", "on_headers_finished")
+    })
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail="Upload too large")
+            parser.write(chunk)
+        parser.finalize()
+        if receiver.path is None:
+            raise HTTPException(status_code=422, detail="Missing file part 'file'")
+    except HTTPException:
+        receiver.discard()
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        receiver.discard()
+        raise HTTPException(status_code=400, detail=f"Malformed multipart body: {e}")
+    return receiver
+
+
+def job_parameters(fields: dict) -> tuple:
+    """(method, options, T, ingest) from the form fields of a job upload."""
+    unknown = set(fields) - set(JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown form fields {sorted(unknown)}")
+    values = dict(JOB_FIELDS, **{key: value for key, value in fields.items() if value != ""})
+    options = json.loads(values["options"]) if values["options"] else None
+    T = float(values["T"]) if values["T"] is not None else None
+    session = values["session"]
+    ingest = {"time_column": values["time_column"], "unit": values["unit"], "ties": values["ties"],
+              "session": tuple(session.split("-")) if session else None}
+    return values["method"], options, T, ingest
+
+
+async def submit_job(kind: str, fn, request: Request) -> dict:
+    pending = sum(1 for job in _jobs.values() if not job["future"].done())
+    if pending >= JOB_WORKERS + JOB_QUEUE:
+        REJECTED.inc(pool="jobs")
+        raise HTTPException(status_code=429, detail="Too many queued jobs, retry later",
+                            headers={"Retry-After": "5"})
+
+    upload = await receive_upload(request)
+    try:
+        method, options, T, ingest = job_parameters(upload.fields)
+    except ValueError as e:
+        upload.discard()
+        raise HTTPException(status_code=422, detail=f"Bad job parameters: {e}")
+
+    path = upload.path
+    job_id = uuid.uuid4().hex
+    job = {"kind": kind, "filename": upload.filename, "created": time.time(), "finished": None}
+    job["future"] = get_job_pool().submit(fn, path, upload.filename or "", ingest, T, method, options)
+    job["future"].add_done_callback(functools.partial(finish_job, job, path))
+    _jobs[job_id] = job
+
+    # forget the oldest finished jobs beyond the history limit
+    finished = [key for key, old in _jobs.items() if old["future"].done()]
+    for key in finished[:max(0, len(finished) - JOB_HISTORY)]:
+        del _jobs[key]
+
+    return dict(job_status(job_id, job), status_url=f"/api/jobs/{job_id}", result_url=f"/api/jobs/{job_id}/result")
+
+
+@app.post("/api/fit", status_code=202)
+async def fit(request: Request):
+    """
+    Queue a Hawkes MLE fit of an uploaded event file.
+
+    multipart/form-data with a "file" part and optional text fields method,
+    options (JSON optimizer options), T, time_column, unit, ties and session
+    ("HH:MM-HH:MM").
+    """
+    return await submit_job("fit", run_fit_job, request)
+
+
+@app.post("/api/compare", status_code=202)
+async def compare(request: Request):
+    """Queue a Poisson vs Hawkes comparison of an uploaded event file (same form fields as /api/fit)."""
+    return await submit_job("compare", run_compare_job, request)
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return job_status(job_id, job)
+
+
+@app.get("/api/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Job result once done; 202 with the status while pending, 422 with the error if it failed."""
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    status = job_status(job_id, job)
+    if status["status"] in ("queued", "running"):
+        return JSONResponse(status, status_code=202)
+    if status["status"] == "failed":
+        raise HTTPException(status_code=422, detail=status["error"])
+    return job["future"].result()
 
 
 if __name__ == "__main__":
@@ -1,23 +1,22 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-from backend.Simulation import HawkesProcess
-from backend.FitModel import FitHawkesModel
-from fastapi.middleware.cors import CORSMiddleware
+"""
+Run the LambdaLab API from the repository root: uvicorn main:app
+
+The application (simulation, fit and compare endpoints) lives in
+backend/main.py; this module only makes backend/ importable and re-exports it.
+The deployed CORS origin list is kept (override with LAMBDALAB_CORS_ORIGINS),
+and the original POST /simulate route is served as an alias.
+"""
 
-app = FastAPI()
+import os
+import secrets
+import sys
 
+from pydantic import BaseModel
 
-origins = [
-    "https://lambdalab.vercel.app",
-]
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+os.environ.setdefault("LAMBDALAB_CORS_ORIGINS", "https://lambdalab.vercel.app")
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+from backend.main import app, simulate_events  # noqa: E402
 
 
 class SimulationRequest(BaseModel):
@@ -26,13 +25,21 @@ class SimulationRequest(BaseModel):
     Beta: float
     T: float
 
+
 @app.post("/simulate")
 def SimulateProcess(Request: SimulationRequest):
-    Process = HawkesProcess(Request.Mu, Request.Alpha, Request.Beta)
-    EventTimes, IntensityTimes, IntensityValues = Process.Simulate(Request.T)
+    # same budgets and supercritical cap as /api/simulate
+    Process, T_run, EventTimes = simulate_events(Request.Mu, Request.Alpha, Request.Beta, Request.T,
+                                                 secrets.randbits(32))
+    IntensityTimes, IntensityValues = Process.GetIntensityCurve(T_run, events=EventTimes)
 
     return {
-        "EventTimes": EventTimes,
-        "IntensityTimes": IntensityTimes,
-        "IntensityValues": IntensityValues
+        "EventTimes": EventTimes.tolist(),
+        "IntensityTimes": IntensityTimes.tolist(),
+        "IntensityValues": IntensityValues.tolist(),
     }
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)